@@ -0,0 +1,41 @@
+"""Synthetic range data for the benchmarks.
+
+ranges are spread uniformly over a domain sized so that, on average, every
+point of a group is covered `density` times.
+"""
+import os
+import random
+import sys
+
+sys.path.insert(0,os.path.join(os.path.dirname(__file__),"..","src"))
+from range_ops.rangers import rangelist, intrange, floatrange
+
+MEAN_LENGTH = 20
+
+def make_ranges(n_ranges,kind="float",n_groups=1,density=1.0,seed=0):
+    """rangelist of n_ranges intrange ("int") or floatrange ("float") objects
+
+    :param n_groups: number of distinct groups, ranges are assigned at random
+    :param density: mean number of ranges covering a point of a group
+    """
+    rnd = random.Random(seed)
+    per_group = max(n_ranges/n_groups,1)
+    domain = per_group*MEAN_LENGTH/density
+    R = rangelist()
+    for _ in range(n_ranges):
+        grp = (rnd.randrange(n_groups),)
+        start = rnd.random()*domain
+        length = rnd.expovariate(1/MEAN_LENGTH)
+        if kind == "int":
+            R.append(intrange(int(start),int(start+length),
+                              closed=rnd.random() < 0.5,group=grp))
+        else:
+            R.append(floatrange(start,start+length,group=grp))
+    return R
+
+def make_dataframe(n_ranges,n_groups=1,density=1.0,seed=0):
+    """DataFrame with start/end/grp/value columns for the from_dataframe benchmark"""
+    R = make_ranges(n_ranges,"float",n_groups,density,seed)
+    for n,r in enumerate(R):
+        r._attributes = {"value":n}
+    return R.to_dataframe(groupby=["grp"])
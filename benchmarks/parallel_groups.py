@@ -0,0 +1,30 @@
+"""Scaling of per-group unique/merge/disect over a process pool.
+
+usage: python benchmarks/parallel_groups.py [n_ranges] [n_groups] [max_workers]
+
+prints the wall time of each operation run serially and with 1, 2, 4, ...
+workers up to max_workers (default: the number of cores).
+"""
+import os
+import sys
+from time import perf_counter
+
+from generators import make_ranges
+
+if __name__ == "__main__":
+    n_ranges = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    n_groups = int(sys.argv[2]) if len(sys.argv) > 2 else 1000
+    max_workers = int(sys.argv[3]) if len(sys.argv) > 3 else (os.cpu_count() or 1)
+    R = make_ranges(n_ranges,n_groups=n_groups,density=2.0)
+    counts = [None] + [2**n for n in range(max_workers.bit_length()) if 2**n <= max_workers]
+    print(f"{n_ranges} ranges in {n_groups} groups, {os.cpu_count()} cores")
+    print(f"{'operation':<10}{'workers':>8}{'seconds':>10}{'speedup':>9}")
+    for name in ("unique","merge","disect"):
+        serial = None
+        for workers in counts:
+            tic = perf_counter()
+            getattr(R,name)(workers=workers)
+            elapsed = perf_counter() - tic
+            serial = serial or elapsed
+            label = "serial" if workers is None else workers
+            print(f"{name:<10}{label:>8}{elapsed:>10.3f}{serial/elapsed:>9.2f}")
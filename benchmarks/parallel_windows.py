@@ -0,0 +1,42 @@
+"""Scaling of windowed unique/merge/disect on a single group over a process pool.
+
+usage: python benchmarks/parallel_windows.py [n_ranges] [max_workers] [windows_per_worker]
+
+all ranges share one group, so only cutting the value domain into windows
+can spread the work. Prints the wall time and throughput of each operation
+run serially and with 1, 2, 4, ... workers up to max_workers (default: the
+number of cores), using windows_per_worker windows per worker (default 4).
+Every parallel result is checked against the serial one.
+"""
+import os
+import sys
+from time import perf_counter
+
+from generators import make_ranges
+from range_ops.rangers import rangelist
+
+# repeated calls on the same list would be served from the result cache
+rangelist.cache_size = 0
+
+if __name__ == "__main__":
+    n_ranges = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    max_workers = int(sys.argv[2]) if len(sys.argv) > 2 else (os.cpu_count() or 1)
+    per_worker = int(sys.argv[3]) if len(sys.argv) > 3 else 4
+    R = make_ranges(n_ranges,n_groups=1,density=2.0)
+    counts = [None] + [2**n for n in range(max_workers.bit_length()) if 2**n <= max_workers]
+    print(f"{n_ranges} ranges in one group, {os.cpu_count()} cores")
+    print(f"{'operation':<10}{'workers':>8}{'windows':>8}{'seconds':>10}{'ranges/s':>12}{'speedup':>9}")
+    for name in ("unique","merge","disect"):
+        serial = expected = None
+        for workers in counts:
+            windows = None if workers is None else per_worker*workers
+            tic = perf_counter()
+            result = getattr(R,name)(workers=workers,windows=windows)
+            elapsed = perf_counter() - tic
+            if expected is None:
+                serial,expected = elapsed,result
+            elif result != expected:
+                raise AssertionError(f"{name} with {workers} workers differs from serial")
+            label = "serial" if workers is None else workers
+            print(f"{name:<10}{label:>8}{windows or '-':>8}{elapsed:>10.3f}"
+                  f"{n_ranges/elapsed:>12.0f}{serial/elapsed:>9.2f}")
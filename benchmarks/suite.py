@@ -0,0 +1,154 @@
+"""Benchmark suite with scaling curves for the rangelist operations.
+
+usage:
+    python benchmarks/suite.py                     # run and print the table
+    python benchmarks/suite.py --save-baseline     # run and store as baseline
+    python benchmarks/suite.py --compare           # run and flag regressions
+
+every operation runs on synthetic intrange and floatrange data over a grid of
+sizes, group counts and overlap densities. Wall time and peak traced memory
+are recorded per case. Once a case takes longer than --max-seconds the larger
+sizes of that curve are skipped. Results are plain JSON, no network needed.
+Exit status is 1 when --compare finds a case slower than the baseline by more
+than --threshold.
+"""
+import argparse
+import gc
+import json
+import os
+import sys
+import tracemalloc
+from time import perf_counter
+
+from generators import make_ranges, make_dataframe
+from range_ops.rangers import rangelist
+
+# repeated calls on the same list would be served from the result cache
+rangelist.cache_size = 0
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_BASELINE = os.path.join(HERE,"results","baseline.json")
+
+## operations: name -> (setup(n, kind, groups, density) -> args, call(*args))
+def _one(n,kind,groups,density):
+    return (make_ranges(n,kind,groups,density),)
+
+def _two(n,kind,groups,density):
+    return (make_ranges(n,kind,groups,density,seed=1),
+            make_ranges(n,kind,groups,density,seed=2))
+
+def _frame(n,kind,groups,density):
+    return (make_dataframe(n,groups,density),)
+
+OPERATIONS = {
+    "unique":(_one,lambda R:R.unique()),
+    "merge":(_one,lambda R:R.merge()),
+    "disect":(_one,lambda R:R.disect()),
+    "duplicates":(_one,lambda R:R.duplicates()),
+    "sort":(_one,lambda R:rangelist(R).sort()),
+    "drop_exact_duplicates":(_one,lambda R:R.drop_exact_duplicates()),
+    "subtract":(_two,lambda A,B:A - B),
+    "intersect":(_two,lambda A,B:A * B),
+    "join":(_two,lambda A,B:A.join(B)),
+    "to_dataframe":(_one,lambda R:R.to_dataframe()),
+    "from_dataframe":(_frame,lambda df:rangelist.from_dataframe(df,"start","end",["grp"],["value"])),
+}
+# dataframe conversion does not depend on the range kind
+FLOAT_ONLY = {"from_dataframe"}
+
+def measure(call,args,memory=True,repeat=3):
+    """best wall time over repeat calls, plus the peak traced memory of one more"""
+    seconds = float("inf")
+    for _ in range(repeat):
+        gc.collect()
+        tic = perf_counter()
+        call(*args)
+        seconds = min(seconds,perf_counter() - tic)
+    peak = None
+    if memory:
+        gc.collect()
+        tracemalloc.start()
+        call(*args)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    return seconds,peak
+
+def case_key(case):
+    return "{op}|{kind}|n={n}|groups={groups}|density={density}".format(**case)
+
+def run(operations,kinds,sizes,groups,densities,max_seconds,memory=True,repeat=3):
+    results = []
+    for op in operations:
+        setup,call = OPERATIONS[op]
+        for kind in kinds:
+            if kind == "int" and op in FLOAT_ONLY:
+                continue
+            for n_groups in groups:
+                for density in densities:
+                    for n in sizes:
+                        args = setup(n,kind,n_groups,density)
+                        seconds,peak = measure(call,args,memory,repeat if n < 100000 else 1)
+                        case = dict(op=op,kind=kind,n=n,groups=n_groups,density=density,
+                                    seconds=seconds,peak_bytes=peak)
+                        results.append(case)
+                        mem = f"{peak/2**20:10.1f}" if peak is not None else f"{'-':>10}"
+                        print(f"{op:<15}{kind:<6}{n:>9}{n_groups:>7}{density:>8}"
+                              f"{seconds:>11.4f}{mem}",flush=True)
+                        if seconds > max_seconds:
+                            break
+    return results
+
+def compare(results,baseline,threshold):
+    """cases slower than the baseline by more than threshold (a fraction)"""
+    previous = {case_key(case):case for case in baseline}
+    regressions = []
+    for case in results:
+        old = previous.get(case_key(case))
+        if old and case["seconds"] > old["seconds"]*(1 + threshold):
+            regressions.append((case,old))
+    return regressions
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--ops",nargs="+",default=list(OPERATIONS),choices=list(OPERATIONS))
+    parser.add_argument("--kinds",nargs="+",default=["int","float"],choices=["int","float"])
+    parser.add_argument("--sizes",nargs="+",type=int,default=[1000,10000,100000,1000000])
+    parser.add_argument("--groups",nargs="+",type=int,default=[1,100])
+    parser.add_argument("--densities",nargs="+",type=float,default=[0.5,4.0])
+    parser.add_argument("--max-seconds",type=float,default=10.0,
+                        help="stop growing a curve once a case takes longer")
+    parser.add_argument("--no-memory",action="store_true",help="skip the tracemalloc pass")
+    parser.add_argument("--repeat",type=int,default=3,
+                        help="timing runs per case below 100k ranges, the best is kept")
+    parser.add_argument("--baseline",default=DEFAULT_BASELINE)
+    parser.add_argument("--save-baseline",action="store_true")
+    parser.add_argument("--compare",action="store_true")
+    parser.add_argument("--threshold",type=float,default=0.25,
+                        help="allowed slowdown against the baseline, as a fraction")
+    parser.add_argument("--output",help="also write the results to this JSON file")
+    args = parser.parse_args(argv)
+
+    print(f"{'operation':<15}{'kind':<6}{'n':>9}{'groups':>7}{'density':>8}"
+          f"{'seconds':>11}{'peak MiB':>10}")
+    results = run(args.ops,args.kinds,args.sizes,args.groups,args.densities,
+                  args.max_seconds,memory=not args.no_memory,repeat=args.repeat)
+
+    for path in filter(None,(args.output,args.baseline if args.save_baseline else None)):
+        os.makedirs(os.path.dirname(os.path.abspath(path)),exist_ok=True)
+        with open(path,"w") as f:
+            json.dump(results,f,indent=1)
+        print(f"results written to {path}")
+
+    if args.compare:
+        with open(args.baseline) as f:
+            regressions = compare(results,json.load(f),args.threshold)
+        for case,old in regressions:
+            print(f"REGRESSION {case_key(case)}: {old['seconds']:.4f}s -> {case['seconds']:.4f}s")
+        if regressions:
+            return 1
+        print(f"no regressions beyond {args.threshold:.0%}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
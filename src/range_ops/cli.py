@@ -0,0 +1,265 @@
+import argparse
+import sys
+from time import perf_counter
+
+import pandas as pd
+
+from .rangers import rangelist, intrange, floatrange
+from .streaming import _checked
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = pq = None
+
+OPERATIONS = ("merge","unique","duplicates","disect","subtract")
+
+## helpers
+def _names(text):
+    """column names from a comma separated argument"""
+    return [name for name in (text or "").split(",") if name]
+
+def _is_parquet(path,fmt):
+    if fmt is not None:
+        return fmt == "parquet"
+    return str(path).endswith((".parquet",".pq"))
+
+def read_chunks(path,columns,chunksize,fmt=None):
+    """DataFrames of at most chunksize rows read from a CSV or Parquet file
+
+    "-" reads CSV from stdin. Parquet needs pyarrow.
+    """
+    if _is_parquet(path,fmt):
+        if pq is None:
+            raise RuntimeError("reading parquet needs pyarrow")
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=chunksize,columns=columns):
+            yield batch.to_pandas()
+        return
+    source = sys.stdin if path == "-" else path
+    yield from pd.read_csv(source,usecols=columns,chunksize=chunksize)
+
+def _sorted_batches(ranges,size):
+    """rangelists of whole overlap clusters from a stream sorted by (group, start)
+
+    ranges of different clusters neither overlap nor adjoin, so merge, unique,
+    duplicates and disect of a batch give exactly their share of the result
+    of the whole stream. Only the cluster still open is held back.
+    """
+    batch,cluster,reach = [],[],None
+    for r,lo,hi,new_group in _checked(ranges):
+        if new_group or lo > reach:
+            batch.extend(cluster)
+            cluster = []
+            reach = hi
+            if len(batch) >= size:
+                yield rangelist(batch)
+                batch = []
+        cluster.append(r)
+        reach = max(reach,hi)
+    batch.extend(cluster)
+    if batch:
+        yield rangelist(batch)
+
+## classes
+class tablewriter(object):
+    """Appends DataFrames to a CSV ("-" for stdout) or Parquet file as they come.
+
+    every frame is reindexed to `columns`, so the output keeps one layout
+    even where a chunk has no value for an attribute.
+    """
+
+    def __init__(self,path,columns,fmt=None):
+        self.path = path
+        self.columns = list(columns)
+        self.parquet = _is_parquet(path,fmt)
+        if self.parquet and pq is None:
+            raise RuntimeError("writing parquet needs pyarrow")
+        self.rows = 0
+        self._handle = self._writer = None
+
+    def __repr__(self):
+        return f"tablewriter({self.path!r},rows={self.rows})"
+
+    def write(self,df):
+        df = df.reindex(columns=self.columns)
+        if self.parquet:
+            table = pa.Table.from_pandas(df,preserve_index=False)
+            if self._writer is None:
+                self._writer = pq.ParquetWriter(self.path,table.schema)
+            self._writer.write_table(table)
+        else:
+            if self._handle is None:
+                self._handle = sys.stdout if self.path == "-" else open(self.path,"w",newline="")
+                df.to_csv(self._handle,index=False)
+            else:
+                df.to_csv(self._handle,index=False,header=False)
+        self.rows += len(df)
+
+    def close(self):
+        if self._handle is None and self._writer is None:
+            # no rows at all, still write the header/schema
+            self.write(pd.DataFrame(columns=self.columns))
+        if self._writer is not None:
+            self._writer.close()
+        if self._handle is not None and self._handle is not sys.stdout:
+            self._handle.close()
+        else:
+            sys.stdout.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self,*exc):
+        self.close()
+        return False
+
+class batchjob(object):
+    """One run of the command line: read, apply the operation, write, report.
+
+    :param args: parsed arguments, see parser()
+    :param stderr: stream receiving progress and timings
+    """
+
+    def __init__(self,args,stderr=None):
+        self.args = args
+        self.stderr = sys.stderr if stderr is None else stderr
+        self.kind = intrange if args.kind == "int" else floatrange
+        self.groups = _names(args.group)
+        self.attributes = _names(args.attributes)
+        self.seconds = {"read":0.0,args.operation:0.0,"write":0.0}
+        self.rows_in = 0
+
+    def __repr__(self):
+        return f"batchjob({self.args.operation},{self.args.input!r})"
+
+    ## columns
+    def __input_columns__(self):
+        columns = [self.args.start,self.args.end] + self.groups + self.attributes
+        if self.args.closed:
+            columns.append(self.args.closed)
+        return list(dict.fromkeys(columns))
+
+    def __output_columns__(self):
+        columns = [self.args.start,self.args.end]
+        if self.kind is intrange:
+            columns.append(self.args.closed or "closed")
+        return columns + self.groups + [a for a in self.attributes if a not in columns]
+
+    ## reading
+    def __ranges__(self,path,fmt):
+        '''rangelists of every input chunk of path'''
+        closed = self.args.closed or not self.args.open
+        chunks = read_chunks(path,self.__input_columns__(),self.args.chunksize,fmt)
+        while True:
+            tic = perf_counter()
+            df = next(chunks,None)
+            if df is None:
+                return
+            ranges = rangelist.from_dataframe(df,self.args.start,self.args.end,self.groups,
+                                              self.attributes,step_size=self.args.step_size,
+                                              kind=self.kind,closed=closed)
+            self.seconds["read"] += perf_counter() - tic
+            yield ranges
+
+    def __counted__(self,chunks):
+        for ranges in chunks:
+            self.rows_in += len(ranges)
+            yield ranges
+
+    ## operations
+    def __batches__(self):
+        '''rangelists of results, as they become available'''
+        op = self.args.operation
+        chunks = self.__counted__(self.__ranges__(self.args.input,self.args.format))
+        if op == "subtract":
+            tic = perf_counter()
+            covered = rangelist.__covered__(r for ranges in self.__ranges__(self.args.against,
+                                                                            self.args.against_format)
+                                            for r in ranges)
+            self.seconds[op] += perf_counter() - tic
+            # A - B cuts every range on its own, chunks stream straight through
+            work = ((ranges,lambda R:R.__masked__(covered,keep=False)) for ranges in chunks)
+        elif self.args.sorted:
+            stream = (r for ranges in chunks for r in ranges)
+            work = ((batch,lambda R:getattr(R,op)())
+                    for batch in _sorted_batches(stream,self.args.chunksize))
+        else:
+            whole = rangelist(r for ranges in chunks for r in ranges)
+            work = iter([(whole,lambda R:getattr(R,op)())])
+        for ranges,apply in work:
+            tic = perf_counter()
+            result = apply(ranges)
+            self.seconds[op] += perf_counter() - tic
+            yield result
+
+    ## writing
+    def __frame__(self,ranges):
+        df = ranges.to_dataframe(groupby=self.groups).drop(columns="uuid")
+        names = {"start":self.args.start,"end":self.args.end}
+        if self.args.closed:
+            names["closed"] = self.args.closed
+        return df.rename(columns=names)
+
+    def __progress__(self,writer,tic,done=False):
+        if self.args.quiet:
+            return
+        line = (f"range_ops {self.args.operation}: {self.rows_in} rows in, "
+                f"{writer.rows} ranges out, {perf_counter() - tic:.2f}s")
+        if done:
+            line += " (" + ", ".join(f"{name} {seconds:.2f}s"
+                                     for name,seconds in self.seconds.items()) + ")"
+        print(line,file=self.stderr,flush=True)
+
+    def run(self):
+        """process the whole input, returns the number of ranges written"""
+        tic = perf_counter()
+        with tablewriter(self.args.output,self.__output_columns__(),self.args.output_format) as writer:
+            for result in self.__batches__():
+                size = self.args.chunksize
+                for n in range(0,len(result),size):
+                    started = perf_counter()
+                    writer.write(self.__frame__(rangelist(result[n:n + size])))
+                    self.seconds["write"] += perf_counter() - started
+                self.__progress__(writer,tic)
+        self.__progress__(writer,tic,done=True)
+        return writer.rows
+
+## command line
+def parser():
+    p = argparse.ArgumentParser(
+        prog="python -m range_ops",
+        description="stream a table of ranges through a range operation")
+    p.add_argument("operation",choices=OPERATIONS)
+    p.add_argument("input",help="CSV or Parquet file, - for CSV on stdin")
+    p.add_argument("-o","--output",default="-",help="CSV or Parquet file, - for CSV on stdout")
+    p.add_argument("--against",help="ranges to subtract, read with the same columns")
+    p.add_argument("--start",default="start",help="start column")
+    p.add_argument("--end",default="end",help="end column")
+    p.add_argument("--group",default="",help="comma separated group columns")
+    p.add_argument("--attributes",default="",help="comma separated attribute columns")
+    p.add_argument("--kind",choices=("int","float"),default="float")
+    p.add_argument("--closed",help="bool column telling whether int ranges include their end")
+    p.add_argument("--open",action="store_true",help="int ranges exclude their end")
+    p.add_argument("--step-size",type=float,default=0.1,help="step size of float ranges")
+    p.add_argument("--chunksize",type=int,default=100000,help="rows per chunk read and written")
+    p.add_argument("--sorted",action="store_true",
+                   help="input is sorted by group then start: process it in bounded memory")
+    p.add_argument("--format",choices=("csv","parquet"),help="input format, by default from the extension")
+    p.add_argument("--against-format",choices=("csv","parquet"))
+    p.add_argument("--output-format",choices=("csv","parquet"))
+    p.add_argument("-q","--quiet",action="store_true",help="no progress on stderr")
+    return p
+
+def main(argv=None,stderr=None):
+    p = parser()
+    args = p.parse_args(argv)
+    if (args.operation == "subtract") != (args.against is not None):
+        p.error("--against is required by subtract, and only by it")
+    if args.chunksize < 1:
+        p.error("--chunksize must be positive")
+    try:
+        batchjob(args,stderr).run()
+    except (RuntimeError,ValueError) as e:
+        p.exit(1,f"{p.prog}: error: {e}\n")
+    return 0
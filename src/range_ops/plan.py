@@ -0,0 +1,299 @@
+from itertools import count
+from time import perf_counter
+
+from .rangers import rangelist, _per_group
+
+## helpers
+# (step, following step) pairs where the second one returns its input:
+# merged, unique and disected ranges have no partial overlaps left
+IDEMPOTENT = {("merge","merge"),("unique","unique"),("disect","disect"),("merge","unique")}
+
+def _union(a,b):
+    """union of two (los, his) sets of disjoint sorted bounds, adjoining bounds joined"""
+    los,his = [],[]
+    for lo,hi in sorted(zip(a[0] + b[0],a[1] + b[1])):
+        if his and lo <= his[-1]:
+            if hi > his[-1]:
+                his[-1] = hi
+        else:
+            los.append(lo)
+            his.append(hi)
+    return los,his
+
+def _intersection(a,b):
+    """intersection of two (los, his) sets of disjoint sorted bounds"""
+    los,his = [],[]
+    i = j = 0
+    while i < len(a[0]) and j < len(b[0]):
+        lo,hi = max(a[0][i],b[0][j]),min(a[1][i],b[1][j])
+        if hi > lo:
+            los.append(lo)
+            his.append(hi)
+        if a[1][i] < b[1][j]:
+            i += 1
+        else:
+            j += 1
+    return los,his
+
+def _difference(a,b):
+    """bounds of a not in b, both (los, his) sets of disjoint sorted bounds"""
+    los,his = [],[]
+    j = 0
+    for lo,hi in zip(*a):
+        while j < len(b[0]) and b[1][j] <= lo:
+            j += 1
+        k = j
+        while k < len(b[0]) and b[0][k] < hi:
+            if b[0][k] > lo:
+                los.append(lo)
+                his.append(b[0][k])
+            lo = max(lo,b[1][k])
+            k += 1
+        if hi > lo:
+            los.append(lo)
+            his.append(hi)
+    return los,his
+
+def _label(operand):
+    if isinstance(operand,rangeplan):
+        return f"rangeplan({len(operand._ops)} operations)"
+    return f"{type(operand).__name__}({len(operand)} ranges)"
+
+## classes
+class rangeplan(object):
+    """Lazy chain of rangelist operations, run when its result is requested.
+
+    made with rangelist.lazy(). The operators - and * (with a rangelist,
+    list or another plan), merge, unique, disect, duplicates and select
+    return a new plan instead of a rangelist. Nothing runs until collect(),
+    iteration or len(). All these operations act on every group on its own,
+    so the plan is optimized before running:
+
+        select      group filters are applied once, to the source and to
+                    the operands
+        masks       consecutive - and * operands are combined into one
+                    set of bounds per group, ranges are then cut in a
+                    single sweep
+        steps       a unique/merge/disect repeating itself, or a unique
+                    right after a merge, is dropped (not a unique after a
+                    first unique ranked by the source's __sort_key__, the
+                    repeat orders its output naturally)
+        per group   the whole chain runs group by group on one groupdict
+                    of the source, with no intermediate list, regrouping or
+                    sorting between operations
+
+    the result equals running the operations eagerly. explain() shows the
+    chain and what the optimizer did, report() the time spent per stage.
+
+    Examples:
+        >>> P = ((A.lazy() - B) * C).merge().unique()
+        >>> print(P.explain())
+        >>> R = P.collect()
+        >>> print(P.report())
+    """
+
+    def __init__(self,source,ops=()):
+        self._source = source
+        self._ops = tuple(ops)
+        self._result = None
+        self._timings = None
+
+    def __repr__(self):
+        return f"rangeplan(source={_label(self._source)},operations={len(self._ops)})"
+
+    def __then__(self,op,operand=None):
+        return rangeplan(self._source,self._ops + ((op,operand),))
+
+    ## chaining
+    def __sub__(self,other):
+        """ranges cut to the parts not covered by other, see rangelist.__sub__"""
+        if not isinstance(other,(rangelist,list,rangeplan)):
+            raise TypeError("lazy plans combine with rangelists, lists or other plans")
+        return self.__then__("sub",other)
+
+    def __mul__(self,other):
+        """ranges cut to the parts covered by other, see rangelist.__mul__"""
+        if not isinstance(other,(rangelist,list,rangeplan)):
+            raise TypeError("lazy plans combine with rangelists, lists or other plans")
+        return self.__then__("mul",other)
+
+    def merge(self):
+        return self.__then__("merge")
+
+    def unique(self):
+        return self.__then__("unique")
+
+    def disect(self):
+        return self.__then__("disect")
+
+    def duplicates(self):
+        return self.__then__("duplicates")
+
+    def select(self,groups):
+        """keep the ranges of the given groups only"""
+        return self.__then__("select",frozenset(groups))
+
+    ## planning
+    def __optimize__(self):
+        '''(groups, stages, notes) of the optimized plan
+
+        groups is None or the groups to keep. Stages are ("mask", [(op, operand), ...])
+        or ("step", name), notes describe the rewrites.
+        '''
+        groups,stages,notes = None,[],[]
+        selects = [operand for op,operand in self._ops if op == "select"]
+        if selects:
+            groups = frozenset.intersection(*selects)
+            notes.append(f"select of {len(groups)} groups pushed down to the source and operands")
+        for op,operand in self._ops:
+            if op == "select":
+                continue
+            if op in ("sub","mul"):
+                if stages and stages[-1][0] == "mask":
+                    stages[-1][1].append((op,operand))
+                else:
+                    stages.append(("mask",[(op,operand)]))
+                continue
+            # a first step ranks by the source sort key, the repeat by natural order
+            keyed = len(stages) == 1 and self._source.__sort_key__ is not None
+            if (stages and stages[-1][0] == "step" and (stages[-1][1],op) in IDEMPOTENT
+                    and not (keyed and op == "unique")):
+                notes.append(f"{op} after {stages[-1][1]} dropped, its input has no overlaps")
+                continue
+            stages.append(("step",op))
+        for kind,arg in stages:
+            if kind == "mask" and len(arg) > 1:
+                notes.append(f"{len(arg)} sweeps fused into one mask")
+        return groups,stages,notes
+
+    def explain(self):
+        """the chain of operations and the optimized plan, as text"""
+        groups,stages,notes = self.__optimize__()
+        lines = [f"plan over {_label(self._source)}:"]
+        for n,(op,operand) in enumerate(self._ops,1):
+            if op == "select":
+                detail = f"{len(operand)} groups"
+            else:
+                detail = _label(operand) if operand is not None else ""
+            lines.append(f"  {n:>2} {op:<11}{detail}".rstrip())
+        lines.append("optimized:")
+        lines.append(f"     {'groups':<11}{'all' if groups is None else len(groups)}")
+        for kind,arg in stages:
+            if kind == "mask":
+                detail = ", ".join(f"{'-' if op == 'sub' else '*'} {_label(operand)}"
+                                   for op,operand in arg)
+                lines.append(f"     {'mask':<11}{detail}")
+            else:
+                lines.append(f"     {arg:<11}per group, on one groupdict")
+        lines.extend(f"  note: {note}" for note in notes)
+        return "\n".join(lines)
+
+    ## running
+    def collect(self):
+        """run the plan once and return the resulting rangelist"""
+        if self._result is None:
+            self._result,self._timings = self.__run__()
+        return self._result
+
+    def __iter__(self):
+        return iter(self.collect())
+
+    def __len__(self):
+        return len(self.collect())
+
+    @staticmethod
+    def __spans__(covers,grp):
+        '''(keep, bounds) of one group, folding a fused mask's operands into one set of bounds'''
+        keep,spans = False,([],[])
+        for op,covered in covers:
+            bounds = covered.get(grp,([],[]))
+            if op == "sub":
+                spans = _difference(spans,bounds) if keep else _union(spans,bounds)
+            else:
+                spans = _intersection(spans,bounds) if keep else _difference(bounds,spans)
+                keep = True
+        return keep,spans
+
+    def __run__(self):
+        '''(result, timings) with timings {stage: [seconds, calls, ranges out]}'''
+        timings = {}
+        def timed(stage,started,out):
+            entry = timings.setdefault(stage,[0.0,0,0])
+            entry[0] += perf_counter() - started
+            entry[1] += 1
+            entry[2] += out
+
+        groups,stages,_ = self.__optimize__()
+        tic = perf_counter()
+        ranges = self._source
+        if groups is not None:
+            ranges = rangelist([r for r in ranges if r._group in groups],
+                               __sort_key__=ranges.__sort_key__)
+        present = set(ranges.__group_codes__()[1])
+        timed("source",tic,len(ranges))
+
+        # operand bounds, only for the groups that are run
+        masks,operands = [],count(1)
+        for kind,arg in stages:
+            if kind != "mask":
+                continue
+            covers = []
+            for op,operand in arg:
+                tic = perf_counter()
+                if isinstance(operand,rangeplan):
+                    operand = operand.collect()
+                covered = rangelist.__covered__(r for r in operand if r._group in present)
+                covers.append((op,covered))
+                timed(f"covers of operand {next(operands)}",tic,
+                      sum(len(los) for los,_ in covered.values()))
+            masks.append(covers)
+        masks = iter(masks)
+
+        # masks before the first step keep the order of the source, as A - B does
+        n = 0
+        while n < len(stages) and stages[n][0] == "mask":
+            tic = perf_counter()
+            covers = next(masks)
+            keep = any(op == "mul" for op,_ in covers)
+            spans = {grp:self.__spans__(covers,grp)[1] for grp in present}
+            ranges = ranges.__masked__(spans,keep)
+            n += 1
+            timed(f"{n} mask",tic,len(ranges))
+        if n == len(stages):
+            return ranges,timings
+
+        tic = perf_counter()
+        gd = ranges.groupdict()
+        timed("group",tic,len(ranges))
+        # the source sort key only ranks the source's own ranges
+        sort_key = self._source.__sort_key__ if n == 0 else None
+        later = [(m,kind,arg,next(masks) if kind == "mask" else None)
+                 for m,(kind,arg) in enumerate(stages[n:],n+1)]
+        results = {}
+        for grp,current in gd.items():
+            key = sort_key
+            for m,kind,arg,covers in later:
+                tic = perf_counter()
+                if kind == "mask":
+                    keep,bounds = self.__spans__(covers,grp)
+                    current = current.__masked__({grp:bounds},keep)
+                else:
+                    current = _per_group(arg,key,[(grp,current)])[0][1]
+                key = None
+                timed(f"{m} {kind if kind == 'mask' else arg}",tic,len(current))
+            results[grp] = current
+
+        tic = perf_counter()
+        result = rangelist.__ungroup__(results)
+        timed("ungroup",tic,len(result))
+        return result,timings
+
+    def report(self):
+        """seconds, calls and ranges out of every stage as a text table, runs the plan if needed"""
+        self.collect()
+        lines = [f"{'stage':<36}{'calls':>8}{'seconds':>11}{'ranges':>10}"]
+        for stage,(seconds,calls,out) in self._timings.items():
+            lines.append(f"{stage:<36}{calls:>8}{seconds:>11.4f}{out:>10}")
+        total = sum(seconds for seconds,_,_ in self._timings.values())
+        lines.append(f"{'total':<36}{'':>8}{total:>11.4f}{len(self._result):>10}")
+        return "\n".join(lines)
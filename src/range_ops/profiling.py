@@ -0,0 +1,182 @@
+from functools import wraps
+from threading import Lock, local
+from time import perf_counter
+
+from .rangers import rangelist, intrange, floatrange
+
+## what gets instrumented
+OPERATIONS = {
+    rangelist:("unique","merge","disect","duplicates","groupdict","__ungroup__",
+               "__per_group__","__unique__","__merge__","__disect__","__duplicates__",
+               "__winners__","__covered__","__masked__","depth_profile","coverage","join",
+               "drop_exact_duplicates","__exact__",
+               "__sub__","__mul__","__floordiv__","__group_attributes__",
+               "__ungroup_attributes__","to_dataframe","from_dataframe"),
+    intrange:("__sub__","__add__","__mul__","__floordiv__","__clip__","__span__",
+              "__lt__","__group_attributes__","__ungroup_attributes__"),
+    floatrange:("__clip__","__span__"),
+}
+CONSTRUCTORS = {
+    intrange:("__init__","_make"),
+    floatrange:("__init__","_make"),
+}
+
+## helpers
+def _rewrap(raw,wrapper):
+    """apply wrapper to the function behind raw, keeping static/class methods"""
+    if isinstance(raw,(staticmethod,classmethod)):
+        return type(raw)(wrapper(raw.__func__))
+    return wrapper(raw)
+
+## classes
+class instrument(object):
+    """Opt-in call counts, timings and allocation counts for range operations.
+
+    while enabled, the methods listed in OPERATIONS are swapped for timing
+    wrappers on their classes and the range constructors count every object
+    they build. Disabling puts the original methods back, so there is no
+    overhead at all when instrumentation is off. Only one instrument can be
+    enabled at a time.
+
+    Every operation records its calls, total (inclusive) seconds, self seconds
+    excluding instrumented callees, and the range objects allocated during it.
+
+    :param callbacks: callables receiving (name, seconds, allocations) after
+        each outermost instrumented call, e.g. to forward metrics
+    :type callbacks: iterable
+
+    Examples:
+        >>> with instrument() as probe:
+        ...     R.unique()
+        >>> probe.snapshot()["rangelist.unique"]["calls"]
+        1
+    """
+    _active = None
+
+    def __init__(self,callbacks=()):
+        self._callbacks = list(callbacks)
+        self._originals = []
+        self._lock = Lock()
+        self._local = local()
+        self.reset()
+
+    def __repr__(self):
+        state = "enabled" if self.enabled else "disabled"
+        return f"instrument({state},operations={len(self._stats)})"
+
+    @property
+    def enabled(self):
+        return instrument._active is self
+
+    def register(self,callback):
+        """add a callable receiving (name, seconds, allocations)"""
+        self._callbacks.append(callback)
+        return callback
+
+    def reset(self):
+        """drop the statistics collected so far"""
+        self._stats = {}
+        self.allocations = 0
+
+    def snapshot(self):
+        """copy of the statistics, as {operation: {calls, seconds, self_seconds, allocations}}"""
+        with self._lock:
+            return {name:dict(zip(("calls","seconds","self_seconds","allocations"),stat))
+                    for name,stat in self._stats.items()}
+
+    def report(self):
+        """statistics as a text table, slowest operations first"""
+        rows = sorted(self.snapshot().items(),key=lambda item:-item[1]["seconds"])
+        lines = [f"{'operation':<36}{'calls':>10}{'seconds':>11}{'self':>11}{'allocs':>11}"]
+        for name,s in rows:
+            lines.append(f"{name:<36}{s['calls']:>10}{s['seconds']:>11.4f}"
+                         f"{s['self_seconds']:>11.4f}{s['allocations']:>11}")
+        return "\n".join(lines)
+
+    ## switching
+    def enable(self):
+        if instrument._active is not None:
+            raise RuntimeError("another instrument is already enabled")
+        instrument._active = self
+        for cls,names in OPERATIONS.items():
+            for name in names:
+                if name in cls.__dict__:
+                    self.__patch__(cls,name,self.__timed__(f"{cls.__name__}.{name}"))
+        for cls,names in CONSTRUCTORS.items():
+            for name in names:
+                if name in cls.__dict__:
+                    self.__patch__(cls,name,self.__counted__)
+        return self
+
+    def disable(self):
+        while self._originals:
+            cls,name,raw = self._originals.pop()
+            setattr(cls,name,raw)
+        if instrument._active is self:
+            instrument._active = None
+        return self
+
+    def __enter__(self):
+        return self.enable()
+
+    def __exit__(self,*exc):
+        self.disable()
+        return False
+
+    def __patch__(self,cls,name,wrapper):
+        '''swap cls.name for a wrapped version, remembering the original'''
+        raw = cls.__dict__[name]
+        self._originals.append((cls,name,raw))
+        setattr(cls,name,_rewrap(raw,wrapper))
+
+    ## wrappers
+    def __frames__(self):
+        '''per-thread stack of [child seconds, allocations] of running operations'''
+        try:
+            return self._local.frames
+        except AttributeError:
+            self._local.frames = []
+            return self._local.frames
+
+    def __timed__(self,name):
+        '''wrapper factory timing calls recorded under name'''
+        def wrapper(func):
+            @wraps(func)
+            def timed(*args,**kwargs):
+                frames = self.__frames__()
+                frame = [0.0,0]
+                frames.append(frame)
+                tic = perf_counter()
+                try:
+                    return func(*args,**kwargs)
+                finally:
+                    elapsed = perf_counter() - tic
+                    frames.pop()
+                    if frames:
+                        frames[-1][0] += elapsed
+                        frames[-1][1] += frame[1]
+                    self.__record__(name,elapsed,frame,outermost=not frames)
+            return timed
+        return wrapper
+
+    def __counted__(self,func):
+        '''wrapper counting range objects built by a constructor'''
+        @wraps(func)
+        def counted(*args,**kwargs):
+            frames = self.__frames__()
+            if frames:
+                frames[-1][1] += 1
+            self.allocations += 1
+            return func(*args,**kwargs)
+        return counted
+
+    def __record__(self,name,elapsed,frame,outermost):
+        with self._lock:
+            stat = self._stats.setdefault(name,[0,0.0,0.0,0])
+            stat[0] += 1
+            stat[1] += elapsed
+            stat[2] += elapsed - frame[0]
+            stat[3] += frame[1]
+        if outermost:
+            for callback in self._callbacks:
+                callback(name,elapsed,frame[1])
@@ -0,0 +1,331 @@
+import os
+from uuid import UUID
+
+import numpy as np
+import pandas as pd
+
+from .rangers import rangelist, intrange, floatrange, _interval_arrays, _interval_bounds, _group_codes
+
+## helpers
+def _distinct(values):
+    """sorted distinct values"""
+    ordered = np.sort(values)
+    keep = np.ones(len(ordered),dtype=bool)
+    keep[1:] = ordered[1:] != ordered[:-1]
+    return ordered[keep]
+
+def _ranked(*values):
+    """sorted distinct values, and the rank of every element of each input
+
+    ranks are exact integers, so (group code, rank) pairs can be packed into a
+    single int64 key and compared without float rounding.
+    """
+    joined = np.concatenate(values)
+    order = np.argsort(joined,kind="stable")
+    ordered = joined[order]
+    distinct = np.ones(len(joined),dtype=bool)
+    distinct[1:] = ordered[1:] != ordered[:-1]
+    rank = np.empty(len(joined),dtype=np.int64)
+    rank[order] = np.cumsum(distinct) - 1
+    return ordered[distinct],np.split(rank,np.cumsum([len(v) for v in values])[:-1])
+
+def _locate(haystack,needles,side="left"):
+    """np.searchsorted, with the needles sorted first for cache friendly lookups"""
+    order = np.argsort(needles,kind="stable")
+    found = np.empty(len(needles),dtype=np.int64)
+    found[order] = np.searchsorted(haystack,needles[order],side=side)
+    return found
+
+def _random_uuids(n):
+    """n random version 4 uuids as a 'V16' array"""
+    raw = np.frombuffer(os.urandom(16*n),dtype=np.uint8).reshape(n,16).copy()
+    raw[:,6] = raw[:,6] & 0x0F | 0x40
+    raw[:,8] = raw[:,8] & 0x3F | 0x80
+    return raw.reshape(-1).view("V16")
+
+def _group_cummax(codes,values):
+    """running maximum of values, restarting whenever the sorted codes change"""
+    if not len(values):
+        return values.copy()
+    uniq,(rank,) = _ranked(values)
+    key = codes.astype(np.int64)*len(uniq) + rank
+    return uniq[np.maximum.accumulate(key) % len(uniq)]
+
+## classes
+class rangearray(object):
+    """Columnar collection of ranges held in contiguous NumPy arrays.
+
+    an alternative to a rangelist of Python objects for large collections.
+    All rows share one kind (intrange or floatrange). Groups are stored as
+    integer codes into `groups`, numbered in order of first appearance.
+    Conversion with `from_rangelist`/`to_rangelist` keeps bounds, closed
+    flags, groups, attributes, uuids and step sizes.
+
+    The set operations are vectorized kernels on the half-open bounds and give
+    the same ranges as the rangelist methods. `unique` always ranks by
+    (group, start, end), any `__sort_key__` of the source list is not used.
+
+    :param starts: range starts
+    :param ends: range ends
+    :param closed: whether each end is included, always False for floatrange
+    :param codes: group code of each row, indexes into `groups`
+    :param groups: distinct group values
+    :param uuids: 16 byte uuid of each row, as a 'V16' array
+    :param attributes: attributes dict of each row, as an object array
+    :param step_size: step size of each row, floatrange only
+    :param kind: intrange or floatrange
+    """
+
+    def __init__(self,starts,ends,closed,codes,groups,uuids,attributes,
+                 step_size=None,kind=floatrange):
+        dtype = np.int64 if kind is intrange else np.float64
+        self.kind = kind
+        self.starts = np.asarray(starts,dtype=dtype)
+        self.ends = np.asarray(ends,dtype=dtype)
+        self.closed = np.asarray(closed,dtype=bool)
+        self.codes = np.asarray(codes,dtype=np.int64)
+        self.groups = list(groups)
+        self.uuids = np.asarray(uuids,dtype="V16")
+        self.attributes = np.asarray(attributes,dtype=object)
+        if kind is floatrange:
+            self.step_size = np.asarray(step_size,dtype=np.float64)
+        else:
+            self.step_size = None
+
+    def __repr__(self):
+        return f"rangearray(kind={self.kind.__name__},ranges={len(self)},groups={len(self.groups)})"
+
+    def __len__(self):
+        return len(self.starts)
+
+    @classmethod
+    def from_rangelist(cls,ranges,kind=None):
+        """build a rangearray from intrange or floatrange objects
+
+        :param kind: row type to use when `ranges` is empty, defaults to floatrange
+        """
+        ranges = list(ranges)
+        kinds = {floatrange if isinstance(r,floatrange) else intrange for r in ranges}
+        if len(kinds) > 1:
+            raise TypeError("rangearray rows must all be intrange or all floatrange")
+        kind = kinds.pop() if kinds else (kind or floatrange)
+        codes,groups = _group_codes(ranges)
+        uuids = np.frombuffer(b"".join(r._uuid.bytes for r in ranges),dtype="V16")
+        attributes = np.empty(len(ranges),dtype=object)
+        attributes[:] = [r._attributes for r in ranges]
+        step_size = [r.step_size for r in ranges] if kind is floatrange else None
+        return cls([r._start for r in ranges],
+                   [r._end for r in ranges],
+                   [r._closed for r in ranges],
+                   codes,groups,uuids,attributes,
+                   step_size=step_size,kind=kind)
+
+    def to_rangelist(self):
+        """convert back to a rangelist of intrange/floatrange objects"""
+        groups = [self.groups[c] for c in self.codes.tolist()]
+        # one hex string per 16 bytes, parsed by UUID without a bytes object per row
+        uuids = map(UUID,self.uuids.tobytes().hex(" ",-16).split()) if len(self) else ()
+        # the columns are already typed and checked, skip the constructors
+        if self.kind is floatrange:
+            rows = zip(self.starts.tolist(),self.ends.tolist(),self.step_size.tolist(),
+                       groups,self.attributes,uuids)
+            return rangelist([floatrange._make(*row) for row in rows])
+        rows = zip(self.starts.tolist(),self.ends.tolist(),self.closed.astype(np.int64).tolist(),
+                   groups,self.attributes,uuids)
+        return rangelist([intrange._make(*row) for row in rows])
+
+    def to_intervals(self,closed=None):
+        """bounds as a pandas IntervalArray, see rangelist.to_intervals
+
+        the start/end columns are used as they are unless `closed` requires
+        shifting them.
+        """
+        return _interval_arrays(self.starts,self.ends,self.closed,self.kind,closed)
+
+    @classmethod
+    def from_intervals(cls,intervals,groups=None,attributes=None,step_size=0.1,kind=None):
+        """build a rangearray from a pandas IntervalArray or IntervalIndex
+
+        the left/right arrays become the start/end columns, groups are coded
+        with pd.factorize and new uuids are drawn in bulk. See
+        rangelist.from_intervals for the arguments.
+        """
+        kind = kind or floatrange
+        starts,ends,closed = _interval_bounds(intervals,kind)
+        n = len(starts)
+        if groups is None:
+            codes,uniques = np.zeros(n,dtype=np.int64),[(1,)]
+        else:
+            groups = pd.Series(list(groups),dtype=object)
+            codes,uniques = pd.factorize(groups)
+        names = list(attributes if attributes is not None else [])
+        rows = np.empty(n,dtype=object)
+        if names:
+            rows[:] = [dict(zip(names,values))
+                       for values in zip(*(list(attributes[a]) for a in names))]
+        else:
+            rows[:] = [{} for _ in range(n)]
+        return cls(starts,ends,np.broadcast_to(closed,(n,)),codes,list(uniques),
+                   _random_uuids(n),rows,
+                   step_size=np.full(n,step_size) if kind is floatrange else None,kind=kind)
+
+    def bounds(self):
+        """half-open (lo, hi) bound arrays of the rows"""
+        if self.kind is intrange:
+            return self.starts,self.ends + self.closed
+        return self.starts,self.ends
+
+    def extent(self):
+        lo,hi = self.bounds()
+        return (hi - lo).sum()
+
+    def __take__(self,rows,lo=None,hi=None,attributes=None):
+        '''new rangearray from source rows, optionally clipped to [lo, hi)
+
+        follows intrange.__clip__: a piece ending where its row ends keeps the
+        row end and closed flag, any other int piece is closed at hi-1.
+        '''
+        starts,ends,closed = self.starts[rows],self.ends[rows],self.closed[rows]
+        if lo is not None:
+            starts = lo
+            if self.kind is intrange:
+                keep = hi == ends + closed
+                ends = np.where(keep,ends,hi - 1)
+                closed = np.where(keep,closed,True)
+            else:
+                ends = hi
+        if attributes is None:
+            attributes = self.attributes[rows]
+        step_size = self.step_size[rows] if self.kind is floatrange else None
+        return rangearray(starts,ends,closed,self.codes[rows],self.groups,
+                          self.uuids[rows],attributes,
+                          step_size=step_size,kind=self.kind)
+
+    def __covered__(self,other):
+        '''merged half-open bounds of other, keyed against the bounds of self
+
+        returns the int64 keys (group code, value rank) of self's bounds and of
+        the disjoint covered intervals of other, plus the value lookup table.
+        Groups of other missing from self are dropped.
+        '''
+        if other.kind is not self.kind:
+            raise TypeError("rangearray operands must hold the same kind of range")
+        code_map = {g:c for c,g in enumerate(self.groups)}
+        other_codes = np.array([code_map.get(g,-1) for g in other.groups],dtype=np.int64)
+        merged = other.merge()
+        codes = other_codes[merged.codes] if len(merged) else merged.codes
+        present = codes >= 0
+        lo,hi = self.bounds()
+        m_lo,m_hi = merged.bounds()
+        m_lo,m_hi,codes = m_lo[present],m_hi[present],codes[present]
+        uniq,(r_lo,r_hi,r_mlo,r_mhi) = _ranked(lo,hi,m_lo,m_hi)
+        order = np.lexsort((r_mlo,codes))
+        size = max(len(uniq),1)
+        key = lambda c,r:c*size + r
+        return (key(self.codes,r_lo),key(self.codes,r_hi),
+                key(codes[order],r_mlo[order]),key(codes[order],r_mhi[order]),
+                uniq,size)
+
+    ## kernels
+    def merge(self):
+        """consolidate adjacent/overlapping ranges, see rangelist.merge"""
+        lo,hi = self.bounds()
+        rows = np.flatnonzero(hi > lo)
+        rows = rows[np.lexsort((-hi[rows],lo[rows],self.codes[rows]))]
+        if not len(rows):
+            return self.__take__(rows)
+        lo,hi,codes = lo[rows],hi[rows],self.codes[rows]
+        reach = _group_cummax(codes,hi)
+        new_run = np.ones(len(rows),dtype=bool)
+        new_run[1:] = (codes[1:] != codes[:-1]) | (lo[1:] > reach[:-1])
+        first = np.flatnonzero(new_run)
+        run_hi = np.maximum.reduceat(hi,first)
+        # the first row of each run reaching the run end supplies it
+        run_id = np.cumsum(new_run) - 1
+        position = np.where(hi == run_hi[run_id],np.arange(len(rows)),len(rows))
+        owner = np.minimum.reduceat(position,first)
+        # as in rangelist.merge, attributes only survive when one row spans the run
+        attributes = self.attributes[rows[first]]
+        for n in np.flatnonzero(owner != first):
+            attributes[n] = {}
+        merged = self.__take__(rows[first],attributes=attributes)
+        merged.ends = self.ends[rows[owner]]
+        merged.closed = self.closed[rows[owner]]
+        return merged
+
+    def unique(self):
+        """remove duplicate range parts according to grouping, see rangelist.unique
+
+        rows are ranked by (group, start, end), ties keep their input order.
+        Each row keeps the part of its range beyond the furthest end of the
+        rows ranked before it.
+        """
+        lo,hi = self.bounds()
+        rows = np.lexsort((self.ends,self.starts,self.codes))
+        lo,hi,codes = lo[rows],hi[rows],self.codes[rows]
+        reach = _group_cummax(codes,hi)
+        start = lo.copy()
+        same = np.flatnonzero(codes[1:] == codes[:-1]) + 1
+        start[same] = np.maximum(lo[same],reach[same - 1])
+        keep = hi > start
+        return self.__take__(rows[keep],start[keep],hi[keep])
+
+    def disect(self):
+        """slice up ranges where portions overlap, see rangelist.disect"""
+        lo,hi = self.bounds()
+        uniq,(r_lo,r_hi) = _ranked(lo,hi)
+        size = max(len(uniq),1)
+        k_lo = self.codes*size + r_lo
+        k_hi = self.codes*size + r_hi
+        cut_points = _distinct(np.concatenate((k_lo,k_hi)))
+        first = _locate(cut_points,k_lo)
+        counts = _locate(cut_points,k_hi) - first
+        rows = np.argsort(self.codes,kind="stable")
+        counts = counts[rows]
+        src = np.repeat(rows,counts)
+        offset = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts,counts)
+        cut = np.repeat(first[rows],counts) + offset
+        return self.__take__(src,uniq[cut_points[cut] % size],uniq[cut_points[cut + 1] % size])
+
+    def __sub__(self,other):
+        """for A - B, return A ranges not covered by B ranges"""
+        k_lo,k_hi,c_lo,c_hi,uniq,size = self.__covered__(other)
+        if not len(c_lo):
+            return self.__take__(np.flatnonzero(k_hi > k_lo))
+        first = _locate(c_hi,k_lo,side="right")
+        last = _locate(c_lo,k_hi,side="left")
+        # every row yields the gaps before, between and after its cover
+        counts = np.maximum(last - first,0) + 1
+        src = np.repeat(np.arange(len(self)),counts)
+        offset = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts,counts)
+        n = np.repeat(first,counts) + offset
+        is_first = offset == 0
+        is_last = offset == counts[src] - 1
+        gap_lo = np.where(is_first,k_lo[src],c_hi[np.clip(n - 1,0,len(c_hi) - 1)])
+        gap_hi = np.where(is_last,k_hi[src],c_lo[np.clip(n,0,len(c_lo) - 1)])
+        gap_lo = np.maximum(gap_lo,k_lo[src])
+        gap_hi = np.minimum(gap_hi,k_hi[src])
+        keep = gap_hi > gap_lo
+        return self.__take__(src[keep],uniq[gap_lo[keep] % size],uniq[gap_hi[keep] % size])
+
+    def __mul__(self,other):
+        """intersection of two rangearrays"""
+        k_lo,k_hi,c_lo,c_hi,uniq,size = self.__covered__(other)
+        first = _locate(c_hi,k_lo,side="right")
+        last = _locate(c_lo,k_hi,side="left")
+        counts = np.maximum(last - first,0)
+        src = np.repeat(np.arange(len(self)),counts)
+        offset = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts,counts)
+        n = np.repeat(first,counts) + offset
+        piece_lo = np.maximum(c_lo[n],k_lo[src])
+        piece_hi = np.minimum(c_hi[n],k_hi[src])
+        keep = piece_hi > piece_lo
+        return self.__take__(src[keep],uniq[piece_lo[keep] % size],uniq[piece_hi[keep] % size])
+
+    def subtract(self,other):
+        """ranges of self not covered by other, same as self - other"""
+        return self - other
+
+    def intersect(self,other):
+        """ranges of self covered by other, same as self * other"""
+        return self * other
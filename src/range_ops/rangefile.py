@@ -0,0 +1,168 @@
+import json
+import pickle
+
+import numpy as np
+
+from .rangers import intrange, floatrange, _typed
+from .rangearray import rangearray
+
+## helpers
+MAGIC = b"RANGEOPS"
+VERSION = 1
+ALIGN = 64
+KINDS = {"intrange":intrange,"floatrange":floatrange}
+
+def _aligned(offset):
+    return -(-offset//ALIGN)*ALIGN
+
+def _encode_attributes(attributes):
+    """(codes, table): every row's attributes as an index into distinct dicts
+
+    dicts with the same items, value types included, share an entry. Dicts
+    holding unhashable values are only shared when they are the same object.
+    """
+    index,table = {},[]
+    codes = np.empty(len(attributes),dtype=np.int64)
+    for n,a in enumerate(attributes):
+        try:
+            key = tuple((k,_typed(v)) for k,v in a.items())
+            hash(key)
+        except TypeError:
+            key = id(a)
+        code = index.get(key)
+        if code is None:
+            code = index[key] = len(table)
+            table.append(a)
+        codes[n] = code
+    return codes,table
+
+def write_rangefile(ranges,path):
+    """write ranges to the binary rangefile format, see rangefile
+
+    :param ranges: all intrange or all floatrange
+    :type ranges: rangelist, rangearray, or any iterable of ranges
+    :param path: file to create or overwrite
+    """
+    if not isinstance(ranges,rangearray):
+        ranges = rangearray.from_rangelist(ranges)
+    attribute_codes,table = _encode_attributes(ranges.attributes)
+    columns = [("starts",ranges.starts),("ends",ranges.ends),("closed",ranges.closed),
+               ("codes",ranges.codes),("attributes",attribute_codes),("uuids",ranges.uuids)]
+    if ranges.kind is floatrange:
+        columns.append(("step_size",ranges.step_size))
+    side = pickle.dumps({"groups":ranges.groups,"attributes":table})
+
+    layout,offset = {},0
+    for name,values in columns:
+        layout[name] = [values.dtype.str,offset]
+        offset = _aligned(offset + values.nbytes)
+    header = json.dumps({"version":VERSION,"kind":ranges.kind.__name__,"rows":len(ranges),
+                         "columns":layout,"side":[offset,len(side)]}).encode()
+    base = _aligned(len(MAGIC) + 8 + len(header))
+    with open(path,"wb") as f:
+        f.write(MAGIC + len(header).to_bytes(8,"little") + header)
+        for name,values in columns:
+            f.seek(base + layout[name][1])
+            f.write(np.ascontiguousarray(values).tobytes())
+        f.seek(base + offset)
+        f.write(side)
+
+## classes
+class rangefile(object):
+    """Read-only, memory-mapped view of a file written by write_rangefile.
+
+    the file holds one fixed-width column per field (start, end, closed,
+    group code, attribute code, uuid and step size for floatrange), each
+    aligned to 64 bytes, followed by a pickled side table with the distinct
+    groups and attribute dicts. Opening maps the file and reads the header
+    and side table only; the columns are NumPy views on the mapping, so rows
+    are paged in by the OS when they are first touched.
+
+    windows of rows come back as rangearray objects whose numeric columns
+    are views on the file, convert them with to_rangelist. The side table is
+    unpickled, only open files from trusted sources.
+
+    :param path: file written by write_rangefile
+
+    Examples:
+        >>> write_rangefile(R,"ranges.bin")
+        >>> F = rangefile("ranges.bin")
+        >>> F[1000:2000].merge().to_rangelist()
+        >>> for chunk in F.chunks(100000):
+        ...     process(chunk)
+    """
+
+    def __init__(self,path):
+        self.path = path
+        self._map = np.memmap(path,dtype=np.uint8,mode="r")
+        if bytes(self._map[:len(MAGIC)]) != MAGIC:
+            raise ValueError(f"{path} is not a rangefile")
+        size = int.from_bytes(bytes(self._map[len(MAGIC):len(MAGIC)+8]),"little")
+        header = json.loads(bytes(self._map[len(MAGIC)+8:len(MAGIC)+8+size]))
+        if header["version"] != VERSION:
+            raise ValueError(f"unsupported rangefile version {header['version']}")
+        base = _aligned(len(MAGIC) + 8 + size)
+        self.kind = KINDS[header["kind"]]
+        self._rows = header["rows"]
+        self._columns = {name:np.frombuffer(self._map,dtype=np.dtype(dtype),count=self._rows,
+                                            offset=base + offset)
+                         for name,(dtype,offset) in header["columns"].items()}
+        offset,length = header["side"]
+        side = pickle.loads(bytes(self._map[base+offset:base+offset+length]))
+        self.groups = side["groups"]
+        self._attributes = side["attributes"]
+
+    def __repr__(self):
+        return f"rangefile({self.path!r},kind={self.kind.__name__},ranges={len(self)})"
+
+    def __len__(self):
+        return self._rows
+
+    def __getitem__(self,rows):
+        """window of rows selected with a contiguous slice, see window"""
+        if not isinstance(rows,slice) or rows.step not in (None,1):
+            raise TypeError("rangefile rows are selected with a contiguous slice")
+        return self.window(*rows.indices(self._rows)[:2])
+
+    def column(self,name):
+        """read-only array of a stored column, e.g. "starts" or "codes" """
+        return self._columns[name]
+
+    def window(self,start=0,stop=None):
+        """rows start:stop as a rangearray
+
+        numeric columns are views on the mapping, only the attribute dicts
+        of the window are built, as copies of the side table entries.
+        """
+        stop = self._rows if stop is None else min(stop,self._rows)
+        start = max(0,min(start,stop))
+        cols = {name:values[start:stop] for name,values in self._columns.items()}
+        attributes = np.empty(stop - start,dtype=object)
+        attributes[:] = [dict(self._attributes[c]) for c in cols["attributes"].tolist()]
+        return rangearray(cols["starts"],cols["ends"],cols["closed"],cols["codes"],
+                          self.groups,cols["uuids"],attributes,
+                          step_size=cols.get("step_size"),kind=self.kind)
+
+    def chunks(self,size):
+        """consecutive windows of up to size rows"""
+        for start in range(0,self._rows,size):
+            yield self.window(start,start + size)
+
+    def to_rangearray(self):
+        return self.window()
+
+    def to_rangelist(self,start=0,stop=None):
+        """rows start:stop as intrange/floatrange objects"""
+        return self.window(start,stop).to_rangelist()
+
+    def close(self):
+        """drop the mapping, windows taken before keep it alive"""
+        self._columns = {}
+        self._map = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self,*exc):
+        self.close()
+        return False
@@ -0,0 +1,168 @@
+from bisect import bisect_left, bisect_right
+from sys import getsizeof
+from time import perf_counter
+
+from .rangers import rangelist, intrange, floatrange
+
+## helpers
+LEAF_SIZE = 16
+
+def _build_tree(items):
+    """centered interval tree over (start, end, range) items sorted by start
+
+    every node holds the ranges containing its center twice, ordered by start
+    and by descending end. Ranges wholly before/after the center go to the
+    left/right subtree. The center is the median start, so both subtrees hold
+    at most half the items. Up to LEAF_SIZE items are kept as a plain leaf.
+    """
+    if not items:
+        return None
+    if len(items) <= LEAF_SIZE:
+        return (None,items)
+    split = len(items)//2
+    center = items[split][0]
+    while split < len(items) and items[split][0] <= center:
+        split += 1
+    # items are sorted by start, so the right subtree is a plain suffix
+    right = items[split:]
+    left = [item for item in items[:split] if item[1] <= center]
+    mid = [item for item in items[:split] if item[1] > center]
+    by_end = sorted(mid,key=lambda item:-item[1])
+    return (center,
+            [item[0] for item in mid],[item[2] for item in mid],
+            [item[1] for item in by_end],[item[2] for item in by_end],
+            _build_tree(left),_build_tree(right))
+
+def _stab_tree(node,value,found):
+    """append the ranges of the tree containing value to found"""
+    while node is not None:
+        if node[0] is None:
+            found.extend(r for lo,hi,r in node[1] if lo <= value < hi)
+            return found
+        center,starts,by_start,ends,by_end,left,right = node
+        if value < center:
+            for lo,r in zip(starts,by_start):
+                if lo > value:
+                    break
+                found.append(r)
+            node = left
+        else:
+            for hi,r in zip(ends,by_end):
+                if hi <= value:
+                    break
+                found.append(r)
+            node = right
+    return found
+
+## classes
+class rangeindex(object):
+    """Static index answering stabbing and overlap queries on a rangelist.
+
+    ranges are partitioned by `group`. Each group keeps its starts sorted and a
+    centered interval tree, so both query types cost O(log n + k) and return
+    the original intrange/floatrange objects, in no particular order.
+
+    Queries use the half-open bounds of the ranges: a closed intrange(1,5)
+    holds 1..5, floatrange(1,5) holds 1 <= x < 5.
+
+    :param ranges: the ranges to index, zero extent ranges are skipped
+    :type ranges: rangelist, or any iterable of intrange/floatrange
+
+    Examples:
+        >>> I = rangeindex(rangelist((floatrange(0,10),floatrange(5,15))))
+        >>> I.stab(12)
+        [floatrange(5.0,15.0,group=(1,))]
+        >>> len(I.overlap(9,11))
+        2
+    """
+
+    def __init__(self,ranges):
+        tic = perf_counter()
+        self._groups = {}
+        self._size = 0
+        for grp,grp_ranges in rangelist(ranges).groupdict().items():
+            items = [(*r.__bounds__(),r) for r in grp_ranges]
+            items = sorted((item for item in items if item[1] > item[0]),
+                           key=lambda item:item[:2])
+            if not items:
+                continue
+            starts = [item[0] for item in items]
+            by_start = [item[2] for item in items]
+            self._groups[grp] = (starts,by_start,_build_tree(items))
+            self._size += len(items)
+        self.build_time = perf_counter() - tic
+
+    def __repr__(self):
+        return f"rangeindex(groups={len(self._groups)},ranges={self._size})"
+
+    def __len__(self):
+        return self._size
+
+    def groups(self):
+        """groups holding at least one indexed range"""
+        return list(self._groups)
+
+    def __select__(self,group):
+        '''index parts to search, all groups when group is None'''
+        if group is None:
+            return list(self._groups.values())
+        elif group in self._groups:
+            return [self._groups[group]]
+        return []
+
+    def stab(self,value,group=None):
+        """ranges containing value
+
+        :param value: point to look up
+        :type value: int|float
+
+        :param group: only search this group, defaults to all groups
+
+        :return: the matching ranges
+        :rtype: rangelist
+        """
+        found = []
+        for starts,by_start,tree in self.__select__(group):
+            _stab_tree(tree,value,found)
+        return rangelist(found)
+
+    def overlap(self,start,end=None,group=None):
+        """ranges overlapping the half-open interval [start, end)
+
+        a range object may be passed as `start`, its bounds and group are
+        then used for the query.
+
+        :return: the matching ranges
+        :rtype: rangelist
+        """
+        if isinstance(start,(intrange,floatrange)):
+            group = start._group
+            start,end = start.__bounds__()
+        found = []
+        if end is None or end <= start:
+            return rangelist()
+        for starts,by_start,tree in self.__select__(group):
+            # ranges holding start, plus those beginning inside (start, end)
+            _stab_tree(tree,start,found)
+            found.extend(by_start[bisect_right(starts,start):bisect_left(starts,end)])
+        return rangelist(found)
+
+    def nbytes(self):
+        """approximate memory used by the index structure in bytes
+
+        the indexed range objects themselves are not counted.
+        """
+        total = getsizeof(self._groups)
+        for starts,by_start,tree in self._groups.values():
+            total += sum(getsizeof(x) for x in starts) + getsizeof(starts) + getsizeof(by_start)
+            nodes = [tree]
+            while nodes:
+                node = nodes.pop()
+                if node is None:
+                    continue
+                elif node[0] is None:
+                    total += getsizeof(node) + getsizeof(node[1]) + sum(getsizeof(item) for item in node[1])
+                    continue
+                total += getsizeof(node) + sum(getsizeof(part) for part in node[1:5])
+                nodes.extend(node[5:])
+        return total
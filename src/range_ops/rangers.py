@@ -1,8 +1,489 @@
-from collections import namedtuple
+from bisect import bisect_left, bisect_right
+from collections import defaultdict, namedtuple, OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache, wraps
+from heapq import heappush, heappop
+from itertools import count
+from operator import attrgetter, itemgetter
+import numpy as np
 import pandas as pd
 from uuid import uuid4,UUID
 
+## helpers
+@lru_cache(maxsize=None)
+def _rangetuple(names):
+    """namedtuple class for a field layout, built once per distinct layout"""
+    return namedtuple('rangeTuple',names)
+
+@lru_cache(maxsize=None)
+def _grouptuple(names):
+    """namedtuple class of the groups made by __group_attributes__, one per field layout"""
+    return namedtuple("attributes",names)
+
+def _group_codes(ranges):
+    """(codes, groups): the group of every range as an index into the distinct groups
+
+    codes are numbered in order of first appearance, equal groups share one.
+    Every group is hashed once, by C-level map calls, after which grouping
+    and sorting run on the int codes.
+    """
+    index = defaultdict(count().__next__)
+    codes = list(map(index.__getitem__,map(attrgetter("_group"),ranges)))
+    return codes,list(index)
+
+class _nestedtypes(dict):
+    """type -> whether _typed has to look inside its values, filled on first use"""
+    def __missing__(self,kind):
+        self[kind] = nested = issubclass(kind,(tuple,frozenset))
+        return nested
+_NESTED = _nestedtypes()
+
+def _typed(value):
+    """value tagged with its type, so True, 1 and 1.0 stay apart as keys"""
+    if isinstance(value,tuple):
+        # the tuple itself plus the types of its items, nested ones tagged in turn
+        types = tuple(map(type,value))
+        if any(map(_NESTED.__getitem__,types)):
+            types = tuple([_typed(v) if _NESTED[kind] else kind for v,kind in zip(value,types)])
+        return (type(value),value,types)
+    if isinstance(value,frozenset):
+        return (type(value),frozenset(map(_typed,value)))
+    return (type(value),value)
+
+def _interned(groups):
+    """groups with equal values, of the same types, replaced by one shared object"""
+    seen = {}
+    return [seen.setdefault(_typed(grp),grp) for grp in groups]
+
+def _as_uuid(value):
+    """UUID of a column value: a UUID, its string form, or None/NaN for a new one"""
+    if value is None or isinstance(value,UUID):
+        return value
+    if isinstance(value,float) and value != value:
+        return None
+    try:
+        return UUID(str(value))
+    except ValueError:
+        raise ValueError(f"uuid column holds {value!r}, not a UUID") from None
+
+def _restore(cls,start,end,closed,group,attributes,uuid):
+    """unpickle a range, see intrange.__reduce__"""
+    return cls._make(start,end,closed,group,attributes,UUID(int=uuid))
+
+def _per_group(name,sort_key,chunk):
+    """run the per-group step of rangelist.<name> on a chunk of groups
+
+    top level so process pools can pickle it, returns [(group, result), ...]
+    """
+    done = []
+    for grp,ranges in chunk:
+        known = isinstance(ranges,rangelist) and ranges.__known_sorted__()
+        ranges = rangelist(ranges,__sort_key__=sort_key)
+        if known:
+            ranges._sorted_at = ranges._version
+        if name == "unique":
+            done.append((grp,ranges.__unique__(ranges)))
+        elif name == "merge":
+            done.append((grp,ranges.__merge__()))
+        elif name == "disect":
+            done.append((grp,ranges.__disect__()))
+        elif name == "duplicates":
+            done.append((grp,ranges.__duplicates__()))
+    return done
+
+def _packed(items,n_chunks):
+    """(key, values) items packed in order into about n_chunks lists of similar total size"""
+    target = max(1,sum(len(values) for _,values in items)//n_chunks)
+    chunks,chunk,size = [],[],0
+    for key,values in items:
+        chunk.append((key,values))
+        size += len(values)
+        if size >= target:
+            chunks.append(chunk)
+            chunk,size = [],0
+    if chunk:
+        chunks.append(chunk)
+    return chunks
+
+def _merge_runs(rows):
+    """(first, last, lo, hi) of every run of overlapping or adjoining rows (lo, hi, n)
+
+    rows are sorted by (lo, -hi, n) and folded in one pass, `first` is the
+    id of the run's first row and `last` that of the first row reaching
+    its end. Rows with hi <= lo are expected to be left out.
+    """
+    runs = []
+    first = None
+    for lo,neg_hi,n in sorted((lo,-hi,n) for lo,hi,n in rows):
+        hi = -neg_hi
+        if first is not None and lo <= run_hi:
+            if hi > run_hi:
+                last,run_hi = n,hi
+            continue
+        if first is not None:
+            runs.append((first,last,run_lo,run_hi))
+        first = last = n
+        run_lo,run_hi = lo,hi
+    if first is not None:
+        runs.append((first,last,run_lo,run_hi))
+    return runs
+
+def _cut_pieces(rows):
+    """(n, lo, hi) pieces of rows (lo, hi, n) cut at every bound among the rows
+
+    pieces come row by row, in order. Empty rows only contribute cut points.
+    """
+    cut_points = sorted({b for lo,hi,_ in rows for b in (lo,hi)})
+    pieces = []
+    for lo,hi,n in rows:
+        k = bisect_right(cut_points,lo)
+        while lo < hi:
+            cut = cut_points[k]
+            pieces.append((n,lo,cut))
+            lo = cut
+            k += 1
+    return pieces
+
+def _winning_stretches(events):
+    """(rank, lo, hi) of the stretches won by each row of events (lo, hi, rank)
+
+    a sweep over the sorted bounds hands each elementary stretch to the best
+    (lowest) rank covering it, consecutive stretches won by the same rank
+    are joined. Sorted by rank then lo, rows with hi <= lo are expected to
+    be left out.
+    """
+    events = sorted(events)
+    points = sorted({e[0] for e in events} | {e[1] for e in events})
+
+    pieces = []
+    active = [] # heap of (rank,hi), expired entries are dropped lazily
+    n = 0
+    winner = None
+    for x in points:
+        while n < len(events) and events[n][0] == x:
+            heappush(active,(events[n][2],events[n][1]))
+            n += 1
+        while active and active[0][1] <= x:
+            heappop(active)
+        top = active[0][0] if active else None
+        if top != winner:
+            if winner is not None:
+                pieces.append((winner,piece_start,x))
+            winner,piece_start = top,x
+
+    pieces.sort()
+    return pieces
+
+# numeric step of each windowed operation, see rangelist.__per_window__
+_WINDOW_KERNELS = {"unique":_winning_stretches,"merge":_merge_runs,"disect":_cut_pieces}
+
+def _per_window(name,chunk):
+    """run the numeric step of rangelist.<name> on a chunk of windows
+
+    top level so process pools can pickle it, returns [(key, result), ...]
+    """
+    kernel = _WINDOW_KERNELS[name]
+    return [(key,kernel(rows)) for key,rows in chunk]
+
+def _window_edges(bounds,windows=None,window_size=None):
+    """sorted inner edges cutting the domain of half-open bounds into windows
+
+    a window count puts the edges at quantiles of the starts, so windows
+    hold similar numbers of ranges. A window size cuts at fixed steps from
+    the smallest start.
+    """
+    if window_size is not None:
+        if not window_size > 0:
+            raise ValueError("window_size must be positive")
+    elif windows is None or windows < 1:
+        raise ValueError("windows must be a positive count")
+    if not bounds:
+        return []
+    starts = [lo for lo,_ in bounds]
+    first = min(starts)
+    if window_size is not None:
+        last = max(hi for _,hi in bounds)
+        edges = [first + k*window_size for k in range(1,int(np.ceil((last - first)/window_size)))]
+        if isinstance(first,int):
+            # int ranges are cut at ints only
+            edges = [int(np.ceil(e)) for e in edges]
+    else:
+        qs = np.quantile(np.array(starts),np.arange(1,windows)/windows,method="inverted_cdf")
+        edges = qs.tolist()
+    return sorted(set(e for e in edges if e > first))
+
+def _clipped_rows(bounds,edges,empty=False):
+    """rows (lo, hi, n) of every window, ranges crossing an edge are cut at it
+
+    empty ranges are left out, or kept as (lo, lo, n) in the window of lo.
+    """
+    rows = [[] for _ in range(len(edges) + 1)]
+    for n,(lo,hi) in enumerate(bounds):
+        k = bisect_right(edges,lo)
+        if hi <= lo:
+            if empty:
+                rows[k].append((lo,lo,n))
+            continue
+        end = bisect_left(edges,hi)
+        while k < end:
+            rows[k].append((lo,edges[k],n))
+            lo = edges[k]
+            k += 1
+        rows[k].append((lo,hi,n))
+    return rows
+
+def _natural_order(ranges):
+    """indices putting a list of ranges in natural order, see intrange.__lt__
+
+    sorts on a cheap (group, start, end) key built once per range, with the
+    group codes replaced by the rank of their group so keys hold numbers
+    only. Only runs of equal keys are sorted again with __lt__, which then
+    also compares the attributes the ranges have in common.
+    """
+    if isinstance(ranges,rangelist):
+        codes,groups = ranges.__group_codes__()
+    else:
+        codes,groups = _group_codes(ranges)
+    rank = [0]*len(groups)
+    for n,code in enumerate(sorted(range(len(groups)),key=groups.__getitem__)):
+        rank[code] = n
+    keys = [(rank[c],r._start,r._end) for c,r in zip(codes,ranges)]
+    order = sorted(range(len(keys)),key=keys.__getitem__)
+    n = 1
+    while n < len(order):
+        if keys[order[n]] != keys[order[n-1]]:
+            n += 1
+            continue
+        m = n + 1
+        while m < len(order) and keys[order[m]] == keys[order[n]]:
+            m += 1
+        order[n-1:m] = sorted(order[n-1:m],key=ranges.__getitem__)
+        n = m + 1
+    return order
+
+class _frozendict(dict):
+    """read-only attributes of a frozen range, pickled as a plain dict"""
+    __slots__ = ()
+
+    def __readonly__(self,*args,**kwargs):
+        raise TypeError("attributes of a frozen range are read-only")
+    __setitem__ = __delitem__ = __ior__ = __readonly__
+    clear = pop = popitem = setdefault = update = __readonly__
+
+    def __reduce__(self):
+        return (dict,(dict(self),))
+
+def _freeze(value):
+    """hashable stand-in for an attribute value
+
+    containers become frozen, lists and dicts tagged with their type so
+    that stand-ins are equal exactly when the values are.
+    """
+    if isinstance(value,dict):
+        try:
+            # hashable values are their own stand-in
+            return (dict,frozenset(value.items()))
+        except TypeError:
+            return (dict,frozenset((k,_freeze(v)) for k,v in value.items()))
+    if isinstance(value,list):
+        return (list,tuple(_freeze(v) for v in value))
+    if isinstance(value,tuple):
+        return tuple(_freeze(v) for v in value)
+    if isinstance(value,set):
+        return frozenset(value)
+    return value
+
+def _from_bounds(like,lo,hi,group):
+    """new range of the kind of `like` covering the half-open bounds [lo, hi)
+
+    int ranges come out closed, float ranges keep the step size of `like`.
+    """
+    if isinstance(like,floatrange):
+        return floatrange._make(lo,hi,like.step_size,group,{},None)
+    return intrange._make(lo,hi-1,1,group,{},None)
+
+# pandas interval side -> shifts applied to (start, half-open end)
+_INTERVAL_SHIFTS = {"left":(0,0),"both":(0,-1),"right":(-1,-1),"neither":(-1,0)}
+
+def _interval_arrays(starts,ends,closed,kind,side=None):
+    """pd.arrays.IntervalArray of range columns
+
+    floatrange rows are [start, end) and always come out closed="left".
+    intrange rows default to "both" when all are closed and "left" otherwise;
+    bounds are only shifted, into new arrays, when the side requires it.
+    An empty open intrange has no interval closed on both sides, asking
+    for "both" then raises ValueError.
+    """
+    starts,ends = np.asarray(starts),np.asarray(ends)
+    if kind is floatrange:
+        if side not in (None,"left"):
+            raise ValueError("floatrange intervals are always closed on the left")
+        return pd.arrays.IntervalArray.from_arrays(starts,ends,closed="left",copy=False)
+    closed = np.asarray(closed,dtype=bool)
+    if side is None:
+        side = "both" if closed.all() else "left"
+    d_lo,d_hi = _INTERVAL_SHIFTS[side]
+    if closed.all() and d_hi == -1 or not closed.any() and d_hi == 0:
+        right = ends
+    else:
+        right = ends + closed + d_hi
+    if side == "both" and (right < starts).any():
+        raise ValueError("empty open int ranges have no interval closed on both sides, "
+                         "use closed='left'")
+    left = starts + d_lo if d_lo else starts
+    return pd.arrays.IntervalArray.from_arrays(left,right,closed=side,copy=False)
+
+def _interval_bounds(intervals,kind):
+    """(starts, ends, closed) arrays of intervals for ranges of kind
+
+    int bounds are moved onto the included integers: (1, 5] gives
+    intrange(2,5). floatrange has no other side than [start, end), the
+    bounds of other sides are taken as they are.
+    """
+    intervals = pd.arrays.IntervalArray(pd.array(intervals))
+    left,right = intervals.left.to_numpy(),intervals.right.to_numpy()
+    if kind is floatrange:
+        return left.astype(np.float64,copy=False),right.astype(np.float64,copy=False),False
+    d_lo,d_hi = _INTERVAL_SHIFTS[intervals.closed]
+    starts = left.astype(np.int64,copy=False) - d_lo
+    return starts,right.astype(np.int64,copy=False),intervals.closed in ("both","right")
+
+def _overlap_pairs(lefts,rights):
+    """(left, right, overlap) of every overlapping pair of two range lists
+
+    one sweep over both lists sorted by start. Each side keeps its active
+    ranges with a heap of their ends, so a range arriving pairs with every
+    active range of the other side still reaching past its start.
+    """
+    items = []
+    for side,ranges in enumerate((lefts,rights)):
+        for n,r in enumerate(ranges):
+            lo,hi = r.__bounds__()
+            if hi > lo:
+                items.append((lo,side,n,hi,r))
+    items.sort(key=lambda item:item[:3])
+    active = ({},{})
+    expiry = ([],[])
+    pairs = []
+    for lo,side,n,hi,r in items:
+        heap,live = expiry[1-side],active[1-side]
+        while heap and heap[0][0] <= lo:
+            del live[heappop(heap)[1]]
+        for other_hi,other in live.values():
+            overlap = min(hi,other_hi) - lo
+            pairs.append((r,other,overlap) if side == 0 else (other,r,overlap))
+        heappush(expiry[side],(hi,n))
+        active[side][n] = (hi,r)
+    return pairs
+
+# sampled points of a rangelist, see rangelist.points
+rangepoints = namedtuple("rangepoints",["values","segments","codes","groups"])
+# a float end within this many steps of a point counts as reached
+_STEP_TOLERANCE = 1e-9
+
+def _point_counts(starts,ends,closed,steps,is_float,endpoint=True):
+    """number of points of every range, computed from the bounds"""
+    counts = ends + closed - starts
+    if is_float.any():
+        span = (ends - starts)/steps
+        if endpoint:
+            stepped = np.floor(span + _STEP_TOLERANCE) + 1
+        else:
+            stepped = np.ceil(span - _STEP_TOLERANCE)
+        counts = np.where(is_float,stepped,counts)
+    return np.maximum(counts,0).astype(np.int64)
+
+def _sample(starts,ends,steps,counts,is_float,lo,hi):
+    """(values, segments) of points lo:hi of the ranges laid end to end
+
+    every value is start + k*step of its range, computed directly instead of
+    accumulated. A float point within tolerance of its range end is set to
+    the end exactly.
+    """
+    stops = np.cumsum(counts)
+    index = np.arange(lo,hi)
+    segments = np.searchsorted(stops,index,side="right")
+    k = index - (stops - counts)[segments]
+    values = starts[segments] + k*steps[segments]
+    if is_float.any():
+        last = ends[segments]
+        snap = is_float[segments] & (np.abs(values - last) <= _STEP_TOLERANCE*steps[segments])
+        values[snap] = last[snap]
+    return values,segments
+
+def _depth_segments(ranges):
+    """[(start, end, depth), ...] of the half-open bounds covered by ranges
+
+    every bound adds or removes one level of depth, points where the depth
+    does not change are skipped so equal depth stretches come out joined.
+    """
+    deltas = {}
+    for r in ranges:
+        lo,hi = r.__bounds__()
+        if hi > lo:
+            deltas[lo] = deltas.get(lo,0) + 1
+            deltas[hi] = deltas.get(hi,0) - 1
+    segments = []
+    depth = 0
+    for x in sorted(deltas):
+        new = depth + deltas[x]
+        if new != depth:
+            if depth:
+                segments.append((start,x,depth))
+            start,depth = x,new
+    return segments
+
 ## decorators
+def _copied(result):
+    """fresh containers holding a cached result's ranges
+
+    rangelists are copied with their sort key and sortedness, dicts (like
+    groupdict) with a copy of every value. Other results are shared.
+    """
+    if isinstance(result,rangelist):
+        copy = rangelist(result,__sort_key__=result.__sort_key__)
+        if result.__known_sorted__():
+            copy._sorted_at = copy._version
+        return copy
+    if isinstance(result,dict):
+        copy = result.copy()
+        for key,value in copy.items():
+            copy[key] = _copied(value)
+        return copy
+    return result
+
+def _memoized(method):
+    """cache the result of a rangelist method until the list is mutated
+
+    results are kept per arguments in a small LRU on the instance, together
+    with the mutation counter and `__sort_key__` they were computed with.
+    Every call returns a shallow copy, so callers can modify what they get
+    without touching the cache or each other's results; the ranges
+    themselves are shared, as they are not to be modified in place.
+    """
+    name = method.__name__
+    @wraps(method)
+    def cached(self,*args,**kwargs):
+        if not self.cache_size:
+            return method(self,*args,**kwargs)
+        key = (name,args,tuple(sorted(kwargs.items())))
+        try:
+            entry = self._cache.get(key)
+        except TypeError:
+            # unhashable arguments
+            return method(self,*args,**kwargs)
+        if entry is not None:
+            version,sort_key,result = entry
+            if version == self._version and sort_key is self.__sort_key__:
+                self._cache.move_to_end(key)
+                return _copied(result)
+        result = method(self,*args,**kwargs)
+        self._cache[key] = (self._version,self.__sort_key__,result)
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+        return _copied(result)
+    return cached
+
 # def _allow_for(*args,types=(int,),**kwargs):
 #     def wrapper(*args,**kwargs):
 #         if isinstance(args[1],types):
@@ -15,6 +496,9 @@ from uuid import uuid4,UUID
 
 ## classes
 class rangelist(list):
+    # results of groupdict/unique/merge/disect/duplicates/coverage kept per
+    # list, 0 turns the cache off (per instance or for the class)
+    cache_size = 8
 
     def __init__(self,*args,**kwargs):
         """
@@ -28,13 +512,99 @@ class rangelist(list):
 
             other *args and **kwargs are passed to the super() list init method
 
+        the list methods changing its content bump a mutation counter, which
+        invalidates the cached results. Ranges are expected not to be
+        modified in place.
         """
         if "__sort_key__" in kwargs:
             self.__sort_key__ = kwargs.pop("__sort_key__")
         else:
             self.__sort_key__ = None
+        self._version = 0
+        self._sorted_at = -1
+        self._cache = OrderedDict()
         super().__init__(*args,**kwargs)
 
+    def __reduce__(self):
+        """pickle/copy the ranges and sort key, without the cache"""
+        return (type(self),(list(self),),{"__sort_key__":self.__sort_key__})
+
+    ## mutations, each one invalidates the cache
+    def append(self,item):
+        self._version += 1
+        super().append(item)
+
+    def extend(self,items):
+        self._version += 1
+        super().extend(items)
+
+    def insert(self,index,item):
+        self._version += 1
+        super().insert(index,item)
+
+    def remove(self,item):
+        self._version += 1
+        super().remove(item)
+
+    def pop(self,*args):
+        self._version += 1
+        return super().pop(*args)
+
+    def clear(self):
+        self._version += 1
+        super().clear()
+
+    def sort(self,*args,**kwargs):
+        """sort in place, in natural order without arguments
+
+        the natural order is sorted on cheap keys, see intrange.__lt__, and
+        remembered until the next mutation. Sorting again is then free.
+        """
+        if args or kwargs:
+            self._version += 1
+            return super().sort(*args,**kwargs)
+        if not self.__known_sorted__():
+            ranked = [self[n] for n in _natural_order(self)]
+            super().__setitem__(slice(None),ranked)
+            self._version += 1
+            self._sorted_at = self._version
+
+    def reverse(self):
+        self._version += 1
+        super().reverse()
+
+    def __setitem__(self,index,value):
+        self._version += 1
+        super().__setitem__(index,value)
+
+    def __delitem__(self,index):
+        self._version += 1
+        super().__delitem__(index)
+
+    def __iadd__(self,other):
+        self._version += 1
+        return super().__iadd__(other)
+
+    def __imul__(self,n):
+        self._version += 1
+        return super().__imul__(n)
+
+    def __known_sorted__(self):
+        """whether the list was found in natural order since its last mutation"""
+        return self._sorted_at == self._version
+
+    def is_sorted(self):
+        """whether the ranges are in natural order
+
+        checked with one pass over the list, a positive answer is kept until
+        the next mutation so internal sorts can be skipped.
+        """
+        if not self.__known_sorted__():
+            if any(b < a for a,b in zip(self,self[1:])):
+                return False
+            self._sorted_at = self._version
+        return True
+
     def extent(self):
         return sum((x.extent() for x in self))
 
@@ -43,39 +613,96 @@ class rangelist(list):
     #         yield(elem)
     def __mul__(self,other):
         """intersection of two rangelists"""
+        if isinstance(other,(rangelist,list)):
+            return self.__masked__(self.__covered__(other),keep=True)
         diff = self - other
         return self - diff
 
     def __sub__(self,other):
         """for A - B, return A ranges not covered by B range"""
         if isinstance(other,(intrange,floatrange)):
-            result=rangelist()
+            result=[]
             for s in self:
                 new=s-other
                 if isinstance(new,rangelist):
-                    for n in new:
-                        result.append(n)
+                    result.extend(new)
                 elif isinstance(new,type(s)):
                     result.append(new)
-            return result
+            return rangelist(result)
         elif isinstance(other,(rangelist,list)):
-            ResultList=rangelist()
-            for s in self:
-                for o in other:
-                    s-=o
-                if s or s.extent():
-                    if isinstance(s,(rangelist,)):
-                        for _s in s:
-                            ResultList.append(_s)
-                    elif isinstance(s,(intrange,floatrange)):
-                        ResultList.append(s)
-            return ResultList
+            return self.__masked__(self.__covered__(other),keep=False)
         else:
             msg=(f"- operator not defined between objects of type {type(self)} "
                  f"and {type(other)}"
                  )
             raise NotImplementedError(msg)
 
+    def __masked__(self,covered,keep):
+        """pieces of every range inside (keep) or outside the covered bounds
+
+        covered maps groups to disjoint sorted bounds, see __covered__. Each
+        range locates its first span with bisect, ranges of groups missing
+        from covered are dropped (keep) or kept whole.
+        """
+        result = [] # plain list, rangelist.append bumps the cache counter
+        for s in self:
+            lo,hi = s.__bounds__()
+            if s._group not in covered:
+                if not keep and hi > lo:
+                    result.append(s)
+                continue
+            los,his = covered[s._group]
+            n = bisect_right(his,lo)
+            if keep:
+                while n < len(los) and los[n] < hi:
+                    a,b = max(lo,los[n]),min(hi,his[n])
+                    if b > a:
+                        result.append(s.__clip__(a,b))
+                    n += 1
+                continue
+            while n < len(los) and los[n] < hi:
+                if los[n] > lo:
+                    result.append(s.__clip__(lo,los[n]))
+                lo = max(lo,his[n])
+                n += 1
+            if hi > lo:
+                result.append(s.__clip__(lo,hi))
+        return rangelist(result)
+
+    @staticmethod
+    def __covered__(ranges):
+        """
+        Static method mapping each group to the bounds it covers.
+
+        intended for internal use, the overlapping/adjoining bounds of each
+        group are merged and returned as two sorted lists of starts and ends,
+        so a range can be located against them with bisect.
+
+        Args:
+            ranges: iterable of intrange/floatrange objects
+
+        Returns:
+            dict: group -> (starts, ends) of disjoint half-open bounds
+        """
+        bounds = {}
+        for r in ranges:
+            lo,hi = r.__bounds__()
+            if hi > lo:
+                bounds.setdefault(r._group,[]).append((lo,hi))
+        covered = {}
+        for grp,grp_bounds in bounds.items():
+            grp_bounds.sort()
+            los,his = [],[]
+            for lo,hi in grp_bounds:
+                if his and lo <= his[-1]:
+                    if hi > his[-1]:
+                        his[-1] = hi
+                else:
+                    los.append(lo)
+                    his.append(hi)
+            covered[grp] = (los,his)
+        return covered
+
     def __floordiv__(self, other):
         """cut elements of self which cross other"""
         if isinstance(other, (int, float)):
@@ -85,15 +712,70 @@ class rangelist(list):
     # def __add__(self,other):
     #     pass
 
-    def groupdict(self):
-        from collections import defaultdict
-        groupdict=defaultdict(rangelist)
+    def lazy(self):
+        """a rangeplan starting from these ranges, see range_ops.plan.rangeplan"""
+        from .plan import rangeplan
+        return rangeplan(self)
+
+    ## exact set operations, ranges are matched with == through their hash
+    def freeze(self):
+        """hashable copies of the ranges, see frozenintrange"""
+        return rangelist([r.freeze() for r in self])
+
+    def __exact__(self):
+        """dict of exact key -> first range of self with it, see intrange.__exact_key__"""
+        exact = {}
         for r in self:
-            try:
-                groupdict[r._group].append(r)
-            except AttributeError:
-                print("AARGH")#DEBUG
-        return groupdict
+            exact.setdefault(r.__exact_key__(),r)
+        return exact
+
+    @_memoized
+    def drop_exact_duplicates(self):
+        """first occurrence of every distinct range, in order
+
+        ranges are duplicates when they are ==, so with the same bounds,
+        closedness, group and attributes, whatever their uuid. One hash
+        lookup per range instead of comparing pairs.
+        """
+        return rangelist(self.__exact__().values())
+
+    def exact_union(self,other):
+        """distinct ranges of self followed by those of other not in self"""
+        exact = self.__exact__()
+        for r in other:
+            exact.setdefault(r.__exact_key__(),r)
+        return rangelist(exact.values())
+
+    def exact_intersection(self,other):
+        """distinct ranges of self also found, exactly, in other"""
+        found = set(rangelist(other).__exact__())
+        return rangelist(r for f,r in self.__exact__().items() if f in found)
+
+    def exact_difference(self,other):
+        """distinct ranges of self not found, exactly, in other
+
+        unlike A - B no range is cut, ranges are kept or dropped whole.
+        """
+        found = set(rangelist(other).__exact__())
+        return rangelist(r for f,r in self.__exact__().items() if f not in found)
+
+    @_memoized
+    def __group_codes__(self):
+        """(codes, groups) of the ranges, see _group_codes"""
+        return _group_codes(self)
+
+    @_memoized
+    def groupdict(self):
+        codes,distinct = self.__group_codes__()
+        buckets = [[] for _ in distinct]
+        for code,r in zip(codes,self):
+            buckets[code].append(r)
+        groups = defaultdict(rangelist,((grp,rangelist(v)) for grp,v in zip(distinct,buckets)))
+        if self.__known_sorted__():
+            # every group of a sorted list is sorted
+            for v in groups.values():
+                v._sorted_at = v._version
+        return groups
 
     @staticmethod
     def __ungroup__(groupdict):
@@ -131,95 +813,563 @@ class rangelist(list):
         return rangelist(ungrouped)
 
     def __group_attributes__(self,with_uuid=False,keys=None):
-        regrouped = [r.__group_attributes__(with_uuid=with_uuid,keys=keys) for r in self]
+        # equal groups are made once and shared, see intrange.__group_attributes__
+        interned = {}
+        regrouped = [r.__group_attributes__(with_uuid=with_uuid,keys=keys,interned=interned)
+                     for r in self]
         return rangelist(regrouped)
 
     def __ungroup_attributes__(self):
         degrouped = [r.__ungroup_attributes__() for r in self]
         return rangelist(degrouped)
 
-    def unique(self):
-        """remove duplicate range parts according to grouping"""
-        #TODO: consider adding ignore grouping option?
-        GD = self.groupdict()
-        for grp in GD:
-            GD[grp] = self.__unique__(GD[grp])
-        return self.__ungroup__(GD)
+    def __per_group__(self,name,workers=None,executor=None,windows=None,window_size=None):
+        """
+        Applies the per-group step of `name` to every group.
 
+        intended for internal use by unique/merge/disect. Without workers or an
+        executor the groups run serially. Otherwise they are packed in order
+        into chunks of similar size, so small groups travel together, mapped
+        over the pool and reassembled in group order. With windows or a
+        window_size, groups are split further, see __per_window__.
 
-    def duplicates(self):
-        '''excluded duplicate portions'''
-        U = self.unique().__group_attributes__(with_uuid=True)
-        S = self.__group_attributes__(with_uuid=True)
-        return (S - U).__ungroup_attributes__()
+        Args:
+            name: "unique", "merge" or "disect"
+            workers: number of processes for a new ProcessPoolExecutor
+            executor: an existing concurrent.futures executor to use instead
+            windows: number of windows to cut every group's domain into
+            window_size: width of the windows, instead of a count
 
-    def __unique__(self,inputRangeList,strict=False):
-        '''underlying method for clipping range elements to remove duplicates'''
-        UniqRange = rangelist()
-        Overlaps = rangelist()
-        iter_over_ranges = sorted(inputRangeList,key=self.__sort_key__)
-        for r in iter_over_ranges:
-            for u in UniqRange:
-                r-=u
-                if not r.extent():
-                    break
-            if isinstance(r,(rangelist,list)):
-                for _r in r:
-                    UniqRange.append(_r)
-            elif isinstance(r,(intrange,floatrange)) and r.extent()>0:
-                UniqRange.append(r)
+        Returns:
+            rangelist: the ungrouped results
+        """
+        if windows is not None or window_size is not None:
+            return self.__per_window__(name,workers,executor,windows,window_size)
+        gd = dict(self.groupdict())
+        if workers is None and executor is None:
+            for grp,result in _per_group(name,self.__sort_key__,gd.items()):
+                gd[grp] = result
+            return self.__ungroup__(gd)
+
+        chunks = _packed([(grp,list(ranges)) for grp,ranges in gd.items()],
+                         4*(workers or getattr(executor,"_max_workers",None) or 1))
+        names = [name]*len(chunks)
+        keys = [self.__sort_key__]*len(chunks)
+        for done in self.__pool_map__(_per_group,(names,keys,chunks),workers,executor):
+            for grp,result in done:
+                gd[grp] = result
+        return self.__ungroup__(gd)
+
+    @staticmethod
+    def __pool_map__(function,columns,workers=None,executor=None):
+        """results of function mapped over columns of arguments on a process pool
+
+        a new ProcessPoolExecutor with `workers` processes unless an existing
+        `executor` is given.
+        """
+        if executor is None:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                return list(pool.map(function,*columns))
+        return list(executor.map(function,*columns))
+
+    def __per_window__(self,name,workers=None,executor=None,windows=None,window_size=None):
+        """
+        Applies the step of `name` to contiguous windows of every group's domain.
+
+        intended for internal use by unique/merge/disect, so a single large
+        group can be spread over a pool. Every group's domain is cut into
+        windows (see _window_edges). The windows get plain (lo, hi, id) rows
+        and run the numeric step of the operation, serially or packed in
+        chunks over the pool like groups:
+
+            merge:  rows are ranges by the window of their start, the runs
+                    of consecutive windows are folded once more
+            unique: ranges ranked as in __unique__ and cut at the window
+                    edges, the pieces a rank wins on both sides of an
+                    edge are rejoined
+            disect: ranges cut at the window edges, the pieces are rejoined
+                    at edges that are no bound of any range
+
+        the result ranges are built from the original ranges, and equal the
+        serial output.
+
+        Returns:
+            rangelist: the ungrouped results
+        """
+        gd = dict(self.groupdict())
+        plans,jobs = {},[]
+        for grp,ranges in gd.items():
+            if name == "unique":
+                ranges = rangelist(ranges,__sort_key__=self.__sort_key__).__ranked__(ranges)
+            bounds = [r.__bounds__() for r in ranges]
+            edges = _window_edges(bounds,windows,window_size)
+            if name == "merge":
+                rows = [[] for _ in range(len(edges) + 1)]
+                for n,(lo,hi) in enumerate(bounds):
+                    if hi > lo:
+                        rows[bisect_right(edges,lo)].append((lo,hi,n))
             else:
-                raise ValueError(f"{r} was unexpected element in rangelist")
-        return UniqRange
+                rows = _clipped_rows(bounds,edges,empty=name == "disect")
+            plans[grp] = (ranges,bounds,edges)
+            jobs.extend(((grp,k),window) for k,window in enumerate(rows) if window)
 
-    def __merge__(self):
-        MergedRange = rangelist()
-        for r in sorted(self.unique()):
-            if MergedRange:
-                M = MergedRange.pop()
-                M += r
-                if isinstance(M,(rangelist,list)):
-                    for _m in M:
-                        MergedRange.append(_m)
-                elif isinstance(M,(intrange,floatrange)) and M.extent()>0:
-                    MergedRange.append(M)
+        results = {grp:[] for grp in gd}
+        if workers is None and executor is None:
+            done = [_per_window(name,jobs)]
+        else:
+            chunks = _packed(jobs,4*(workers or getattr(executor,"_max_workers",None) or 1))
+            done = self.__pool_map__(_per_window,([name]*len(chunks),chunks),workers,executor)
+        for chunk in done:
+            for (grp,k),result in chunk:
+                results[grp].extend(result)
+
+        for grp,(ranges,bounds,edges) in plans.items():
+            found = results[grp]
+            stitched = []
+            if name == "merge":
+                # runs of consecutive windows, in order of their starts
+                for first,last,lo,hi in found:
+                    if stitched and lo <= stitched[-1][3]:
+                        if hi > stitched[-1][3]:
+                            stitched[-1] = (stitched[-1][0],last,stitched[-1][2],hi)
+                        continue
+                    stitched.append((first,last,lo,hi))
+                gd[grp] = rangelist([ranges[f] if f == l else ranges[f].__span__(ranges[l])
+                                     for f,l,_,_ in stitched])
+                continue
+            if name == "unique":
+                found.sort()
+                joinable = set(edges)
             else:
-                MergedRange.append(r)
-        return MergedRange
-
-    def merge(self):
-        """consolidate adjacent/overlapping ranges."""
-        gd=self.groupdict()
-        for grp in gd:
-            gd[grp]=gd[grp].__merge__()
+                # pieces of every range in order, windows were already in order
+                found.sort(key=itemgetter(0))
+                edge_set = set(edges)
+                joinable = edge_set - {b for lo_hi in bounds for b in lo_hi if b in edge_set}
+            for n,lo,hi in found:
+                if stitched and stitched[-1][0] == n and stitched[-1][2] == lo and lo in joinable:
+                    stitched[-1] = (n,stitched[-1][1],hi)
+                else:
+                    stitched.append((n,lo,hi))
+            gd[grp] = rangelist([ranges[n].__clip__(lo,hi) for n,lo,hi in stitched])
         return self.__ungroup__(gd)
 
-    def disect(self):
-        """slice up ranges where portions overlap"""
-        gd = self.groupdict()
-        for grp in gd:
-            new_ranges = rangelist(gd[grp])
-            cut_points = set([r._start for r in new_ranges] + [r._end for r in new_ranges])
-            while cut_points:
-                cut = cut_points.pop()
-                new_ranges = new_ranges // cut
-            gd[grp] = new_ranges
-        return self.__ungroup__(gd)
+    @_memoized
+    def unique(self,workers=None,executor=None,windows=None,window_size=None):
+        """remove duplicate range parts according to grouping
 
-    def to_dataframe(self):
-        return pd.DataFrame((x._astuple() for x in self))
+        groups can be spread over a process pool with `workers` (or an
+        existing `executor`), `__sort_key__` must then be picklable. With
+        `windows` (a count) or a `window_size`, every group's value domain is
+        also cut into contiguous windows processed separately, for groups too
+        large to handle as one; the result is the same.
+        """
+        #TODO: consider adding ignore grouping option?
+        return self.__per_group__("unique",workers=workers,executor=executor,
+                                  windows=windows,window_size=window_size)
 
-    @staticmethod
-    def from_dataframe(df,start,end,groupby,attributes=None,step_size=0.1):
+
+    @_memoized
+    def duplicates(self,workers=None,executor=None):
+        """excluded duplicate portions
+
+        the parts of every range that unique() drops in favour of a preferred
+        range, groups can be spread over a process pool, see unique.
+        """
+        return self.__per_group__("duplicates",workers=workers,executor=executor)
+
+    def __duplicates__(self):
+        '''parts of a single group's ranges covered by a preferred range
+
+        runs the unique sweep once and returns, range by range in input order,
+        the gaps between the pieces each range keeps.
+        '''
+        key = self.__sort_key__
+        if key is None:
+            order = range(len(self)) if self.__known_sorted__() else _natural_order(self)
+        else:
+            order = sorted(range(len(self)),key=lambda n:key(self[n]))
+        kept = [[] for _ in order]
+        for rank,lo,hi in self.__winners__([self[n] for n in order]):
+            kept[rank].append((lo,hi))
+        rank_of = [0]*len(order)
+        for rank,n in enumerate(order):
+            rank_of[n] = rank
+        result = []
+        for n,r in enumerate(self):
+            lo,hi = r.__bounds__()
+            for piece_lo,piece_hi in kept[rank_of[n]]:
+                if piece_lo > lo:
+                    result.append(r.__clip__(lo,piece_lo))
+                lo = piece_hi
+            if hi > lo:
+                result.append(r.__clip__(lo,hi))
+        return rangelist(result)
+
+    def depth_profile(self):
+        """coverage depth of every group
+
+        one sweep over the sorted bounds per group. Segments use half-open
+        bounds, so a closed intrange(1,5) covers [1, 6).
+
+        Returns:
+            dict: group -> [(start, end, depth), ...] sorted by start, only
+            stretches covered at least once, neighbours differ in depth
+
+        Examples:
+            >>> R = rangelist((floatrange(0,10),floatrange(5,15)))
+            >>> R.depth_profile()
+            {(1,): [(0.0, 5.0, 1), (5.0, 10.0, 2), (10.0, 15.0, 1)]}
+        """
+        return {grp:_depth_segments(ranges) for grp,ranges in self.groupdict().items()}
+
+    def points(self,endpoint=True,chunk=None):
+        """
+        Materializes the values of all ranges as NumPy arrays.
+
+        intrange rows give their integers, floatrange rows give start + k*step
+        for k = 0, 1, ... up to the end (see floatrange.points). Counts and
+        values are computed arithmetically for all rows at once.
+
+        Args:
+            endpoint: whether floatrange rows include their end when a step
+                lands on it, False samples the half-open [start, end)
+            chunk: yield rangepoints of at most this many points instead of
+                one result, long ranges are split across chunks
+
+        Returns:
+            rangepoints(values, segments, codes, groups): the values (int64,
+            or float64 when floatrange rows are present), the index of the
+            range each value comes from, its group code and the distinct
+            groups the codes point into
+
+        Examples:
+            >>> R = rangelist((intrange(1,3),intrange(7,8,group=(2,))))
+            >>> R.points()
+            rangepoints(values=array([1, 2, 3, 7, 8]), segments=array([0, 0, 0, 1, 1]),
+                        codes=array([0, 0, 0, 1, 1]), groups=[(1,), (2,)])
+        """
+        is_float = np.array([isinstance(r,floatrange) for r in self],dtype=bool)
+        dtype = np.float64 if is_float.any() else np.int64
+        starts = np.array([r._start for r in self],dtype=dtype)
+        ends = np.array([r._end for r in self],dtype=dtype)
+        closed = np.array([r._closed for r in self],dtype=dtype)
+        steps = np.array([r.step_size if f else 1 for r,f in zip(self,is_float)],dtype=dtype)
+        groups = {}
+        codes = np.array([groups.setdefault(r._group,len(groups)) for r in self],dtype=np.int64)
+        counts = _point_counts(starts,ends,closed,steps,is_float,endpoint)
+        total = int(counts.sum())
+
+        def window(lo,hi):
+            values,segments = _sample(starts,ends,steps,counts,is_float,lo,hi)
+            return rangepoints(values,segments,codes[segments],list(groups))
+        if chunk is None:
+            return window(0,total)
+        return (window(lo,min(lo + chunk,total)) for lo in range(0,total,chunk))
+
+    def join(self,other,dataframe=False):
+        """overlap join: every pair of ranges from self and other sharing
+        a group and overlapping
+
+        a sort-merge sweep per group, O((n+m) log(n+m) + k) for k pairs.
+        Ranges only touching at a bound do not overlap.
+
+        Args:
+            other: the right hand rangelist
+            dataframe: return a DataFrame instead of tuples, with the
+                to_dataframe columns of both sides prefixed by "left_" and
+                "right_", plus an "overlap" column
+
+        Returns:
+            list of (left, right, overlap extent) tuples, by group and then
+            by the later start of the pair
+
+        Examples:
+            >>> A = rangelist((floatrange(0,10),))
+            >>> B = rangelist((floatrange(5,20),floatrange(8,9)))
+            >>> A.join(B)
+            [(floatrange(0.0,10.0,group=(1,)), floatrange(5.0,20.0,group=(1,)), 5.0),
+             (floatrange(0.0,10.0,group=(1,)), floatrange(8.0,9.0,group=(1,)), 1.0)]
+        """
+        right_groups = rangelist(other).groupdict()
+        pairs = []
+        for grp,lefts in self.groupdict().items():
+            rights = right_groups.get(grp)
+            if rights:
+                pairs.extend(_overlap_pairs(lefts,rights))
+        if not dataframe:
+            return pairs
+        lefts = rangelist(p[0] for p in pairs).to_dataframe().add_prefix("left_")
+        rights = rangelist(p[1] for p in pairs).to_dataframe().add_prefix("right_")
+        joined = pd.concat([lefts,rights],axis=1)
+        joined["overlap"] = [p[2] for p in pairs]
+        return joined
+
+    @_memoized
+    def coverage(self,k=1):
+        """regions covered by at least k ranges of the same group
+
+        new ranges without attributes, of the kind of the first range of their
+        group. k=1 gives the merged footprint, k=2 every overlap.
+
+        Examples:
+            >>> R = rangelist((intrange(1,10),intrange(5,15),intrange(8,20)))
+            >>> R.coverage(2)
+            [intrange(5,15,closed=True,group=(1,))]
+        """
         result = rangelist()
-        for rng,row in df.set_index([start,end]).iterrows():
-            if attributes:
-                attrib = dict(row[attributes])
-            else:
-                attrib={}
-            result.append(floatrange(*rng,step_size,group=tuple(row[groupby]),attributes=attrib))
+        for grp,ranges in self.groupdict().items():
+            first = ranges[0]
+            los,his = [],[]
+            for lo,hi,depth in _depth_segments(ranges):
+                if depth < k:
+                    continue
+                if his and his[-1] == lo:
+                    his[-1] = hi
+                else:
+                    los.append(lo)
+                    his.append(hi)
+            result.extend(_from_bounds(first,lo,hi,grp) for lo,hi in zip(los,his))
         return result
 
+    def __unique__(self,inputRangeList,strict=False):
+        '''underlying method for clipping range elements to remove duplicates
+
+        ranges are ranked by `__sort_key__` (natural order without one, skipped
+        when the list is known to be sorted), then a single sweep over the sorted
+        boundaries hands each elementary stretch to the best ranked range
+        covering it. Consecutive stretches won by the same range are rejoined,
+        so every range keeps exactly the parts not covered by a preferred one.
+        '''
+        ranked = self.__ranked__(inputRangeList)
+        return rangelist(ranked[rank].__clip__(lo,hi) for rank,lo,hi in self.__winners__(ranked))
+
+    def __ranked__(self,ranges):
+        '''ranges as a list ordered by `__sort_key__`, or in natural order without one'''
+        if self.__sort_key__ is not None:
+            return sorted(ranges,key=self.__sort_key__)
+        if isinstance(ranges,rangelist) and ranges.__known_sorted__():
+            return list(ranges)
+        ranges = list(ranges)
+        return [ranges[n] for n in _natural_order(ranges)]
+
+    @staticmethod
+    def __winners__(ranked):
+        '''(rank, lo, hi) of the stretches won by each range, see __unique__
+
+        sorted by rank then lo, so the pieces of every range come in order.
+        '''
+        events = []
+        for rank,r in enumerate(ranked):
+            lo,hi = r.__bounds__()
+            if hi > lo:
+                events.append((lo,hi,rank))
+        return _winning_stretches(events)
+
+    def __merge__(self):
+        '''coalesce overlapping or adjoining ranges of a single group
+
+        ranges are sorted once by their half-open bounds (widest first for a
+        shared start) and folded in a single pass. A run covered by one range
+        returns that range, longer runs are spanned from the first range to
+        the range reaching furthest.
+        '''
+        rows = []
+        for n,r in enumerate(self):
+            lo,hi = r.__bounds__()
+            if hi > lo:
+                rows.append((lo,hi,n))
+        return rangelist([self[f] if f == l else self[f].__span__(self[l])
+                          for f,l,_,_ in _merge_runs(rows)])
+
+    @_memoized
+    def merge(self,workers=None,executor=None,windows=None,window_size=None):
+        """consolidate adjacent/overlapping ranges.
+
+        groups, and windows of their domain, can be spread over a process
+        pool, see unique.
+        """
+        return self.__per_group__("merge",workers=workers,executor=executor,
+                                  windows=windows,window_size=window_size)
+
+    def __disect__(self):
+        '''cut the ranges of a single group at every bound inside them
+
+        the bounds are sorted once and each range locates its first cut with
+        bisect, pieces keep the group/attributes/uuid of their range.
+        '''
+        rows = [(*r.__bounds__(),n) for n,r in enumerate(self)]
+        return rangelist([self[n].__clip__(lo,hi) for n,lo,hi in _cut_pieces(rows)])
+
+    @_memoized
+    def disect(self,workers=None,executor=None,windows=None,window_size=None):
+        """slice up ranges where portions overlap
+
+        groups, and windows of their domain, can be spread over a process
+        pool, see unique.
+        """
+        return self.__per_group__("disect",workers=workers,executor=executor,
+                                  windows=windows,window_size=window_size)
+
+    def to_dataframe(self,groupby=None,interval=None):
+        """
+        Converts the ranges to a DataFrame, one row per range.
+
+        columns are built as whole arrays: start, end, closed (only when int
+        ranges are present), uuid, the group column(s) and one column per
+        attribute key. Missing attributes are left as None.
+
+        Args:
+            groupby: column names to unpack the group tuples into,
+                by default a single "group" column holds the tuples.
+            interval: name of a pandas interval column replacing start,
+                end and closed, see to_intervals
+
+        Returns:
+            pd.DataFrame
+        """
+        if interval is not None:
+            columns = {interval:self.to_intervals()}
+        else:
+            columns = {"start":[r._start for r in self],
+                       "end":[r._end for r in self]}
+            if any(not isinstance(r,floatrange) for r in self):
+                columns["closed"] = [bool(r._closed) for r in self]
+        columns["uuid"] = [r._uuid for r in self]
+        groups = [r._group for r in self]
+        if groupby is None:
+            columns["group"] = groups
+        else:
+            for n,name in enumerate(groupby):
+                columns[name] = [g[n] for g in groups]
+        keys = dict.fromkeys(k for r in self for k in r._attributes)
+        for key in keys:
+            columns[key] = [r._attributes.get(key) for r in self]
+        return pd.DataFrame(columns)
+
+    def to_intervals(self,closed=None):
+        """
+        Converts the bounds to a pandas IntervalArray, one interval per range.
+
+        groups and attributes are not part of an IntervalArray, see
+        to_dataframe(interval=...) to keep them alongside.
+
+        Args:
+            closed: side of the intervals for intrange rows, by default
+                "both" when every range is closed and "left" otherwise.
+                floatrange rows are always "left". "both" raises ValueError
+                for empty open intranges such as intrange(3,3,closed=False).
+
+        Returns:
+            pd.arrays.IntervalArray, wrap it in pd.IntervalIndex as needed
+        """
+        kinds = {floatrange if isinstance(r,floatrange) else intrange for r in self}
+        if len(kinds) > 1:
+            raise TypeError("intervals need all intrange or all floatrange rows")
+        kind = kinds.pop() if kinds else floatrange
+        dtype = np.int64 if kind is intrange else np.float64
+        return _interval_arrays(np.fromiter((r._start for r in self),dtype,len(self)),
+                                np.fromiter((r._end for r in self),dtype,len(self)),
+                                np.fromiter((r._closed for r in self),bool,len(self)),
+                                kind,closed)
+
+    @staticmethod
+    def from_intervals(intervals,groups=None,attributes=None,step_size=0.1,kind=None):
+        """
+        Builds a rangelist from a pandas IntervalArray or IntervalIndex.
+
+        the left/right arrays are read whole. For intrange the bounds are
+        moved onto the included integers, so (1, 5] gives intrange(2,5) and
+        [1, 5) gives intrange(1,5,closed=False).
+
+        Args:
+            intervals: IntervalArray, IntervalIndex or interval Series
+            groups: group of each interval, defaults to (1,) for all
+            attributes: DataFrame or dict of columns copied into the
+                attributes of each range
+            step_size: step size of floatrange rows
+            kind: floatrange (default) or intrange
+
+        Returns:
+            rangelist
+        """
+        kind = kind or floatrange
+        starts,ends,closed = _interval_bounds(intervals,kind)
+        n = len(starts)
+        groups = [(1,)]*n if groups is None else list(groups)
+        names = list(attributes if attributes is not None else [])
+        if names:
+            attribs = [dict(zip(names,values))
+                       for values in zip(*(list(attributes[a]) for a in names))]
+        else:
+            attribs = [{} for _ in range(n)]
+        flags = np.broadcast_to(np.asarray(closed,dtype=np.int64),(n,)).tolist()
+        return rangelist.__from_columns__(starts.tolist(),ends.tolist(),flags,groups,
+                                          attribs,[None]*n,kind,step_size)
+
+    @staticmethod
+    def __from_columns__(starts,ends,flags,groups,attribs,uuids,kind,step_size):
+        '''rangelist from per-row lists of checked values, via the fast constructors
+
+        equal groups are interned, so the rows share one object per group.
+        '''
+        groups = _interned(groups)
+        if kind is floatrange:
+            return rangelist([floatrange._make(s,e,step_size,g,a,u)
+                              for s,e,g,a,u in zip(starts,ends,groups,attribs,uuids)])
+        return rangelist([intrange._make(s,e,c,g,a,u)
+                          for s,e,c,g,a,u in zip(starts,ends,flags,groups,attribs,uuids)])
+
+    @staticmethod
+    def from_dataframe(df,start,end,groupby,attributes=None,step_size=0.1,
+                       kind=None,closed=True,uuid=None):
+        """
+        Builds a rangelist from the rows of a DataFrame.
+
+        whole columns are read at once instead of iterating over the rows.
+
+        Args:
+            df: source DataFrame
+            start, end: columns holding the range bounds, or the name of a
+                pandas interval column and None, see from_intervals
+            groupby: column name(s) forming the group tuple of each range
+            attributes: column names copied into the attributes of each range
+            step_size: step size of floatrange rows
+            kind: floatrange (default) or intrange
+            closed: bool, or the name of a bool column, for intrange rows
+            uuid: optional column of UUIDs, or their strings as read back
+                from CSV, to restore range identities. Missing values get
+                new uuids.
+
+        Returns:
+            rangelist
+        """
+        kind = kind or floatrange
+        if isinstance(groupby,str):
+            groupby = [groupby]
+        attributes = list(attributes or [])
+        assert "group" not in attributes,"reserved keyword 'group' should not be in attributes"
+        assert "uuid" not in attributes,"reserved keyword 'uuid' should not be in attributes"
+        dtype = np.int64 if kind is intrange else np.float64
+        if end is None:
+            lo,hi,closed = _interval_bounds(df[start],kind)
+        else:
+            lo = df[start].to_numpy().astype(dtype)
+            hi = df[end].to_numpy().astype(dtype)
+        starts = np.minimum(lo,hi).tolist()
+        ends = np.maximum(lo,hi).tolist()
+        groups = list(zip(*(df[g].tolist() for g in groupby))) if groupby else [()]*len(df)
+        if attributes:
+            attribs = [dict(zip(attributes,values))
+                       for values in zip(*(df[a].tolist() for a in attributes))]
+        else:
+            attribs = [{} for _ in range(len(df))]
+        uuids = [_as_uuid(u) for u in df[uuid].tolist()] if uuid else [None]*len(df)
+        if isinstance(closed,str):
+            flags = [1 if c else 0 for c in df[closed].tolist()]
+        else:
+            flags = [1 if closed else 0]*len(df)
+        return rangelist.__from_columns__(starts,ends,flags,groups,attribs,uuids,kind,step_size)
+
 class intrange(object):
     """Closed range object of all integer values between min and max.
 
@@ -242,22 +1392,58 @@ class intrange(object):
     :type attributes: dict
 
 
+    :param uuid: identifier shared by all pieces derived from the range,
+        generated on first read when not given
+    :type uuid: UUID
+
     """
+    __slots__ = ("_start","_end","_closed","_group","_attributes","_uid")
 
-    def __init__(self, min_val, max_val, closed=True, group=(1,), attributes=None, uuid=uuid4()):
+    def __init__(self, min_val, max_val, closed=True, group=(1,), attributes=None, uuid=None):
         self._start=int(min(min_val,max_val))
         self._end=int(max(min_val,max_val))
         self._closed=1 if closed else 0
-        self._open = 1-self._closed
         self._group=group
         if attributes is None:
             attributes = {}
         self._attributes=attributes
-        self._uuid = uuid or uuid4()
-        assert isinstance(self._uuid,UUID), "attribute 'uuid' must be a UUID instance"
+        self._uid = uuid
+        assert uuid is None or isinstance(uuid,UUID), "attribute 'uuid' must be a UUID instance"
         assert "group" not in attributes,"reserved keyword 'group' should not be in attributes"
         assert "uuid" not in attributes,"reserved keyword 'uuid' should not be in attributes"
 
+    @classmethod
+    def _make(cls,start,end,closed,group,attributes,uuid):
+        """build a range from trusted values, skipping the checks of __init__
+
+        intended for results derived from existing ranges: start <= end,
+        attributes is a dict and uuid a UUID or None.
+        """
+        self = object.__new__(cls)
+        self._start = start
+        self._end = end
+        self._closed = closed
+        self._group = group
+        self._attributes = attributes
+        self._uid = uuid
+        return self
+
+    @property
+    def _uuid(self):
+        """uuid of the range, generated on first read"""
+        if self._uid is None:
+            self._uid = uuid4()
+        return self._uid
+
+    @property
+    def _open(self):
+        return 1-self._closed
+
+    def __reduce__(self):
+        """pickle/copy through _make, the uuid is fixed first so copies share it"""
+        return (_restore,(type(self),self._start,self._end,self._closed,
+                          self._group,self._attributes,self._uuid.int))
+
     def __repr__(self):
         '''string representing constructor for the object'''
         S = self._start
@@ -314,6 +1500,39 @@ class intrange(object):
         # return length (assuming step size of 1)
         return self._end-self._start + self._closed
 
+    def points(self,endpoint=True,chunk=None):
+        """values of the range as a NumPy array, or a generator of arrays of
+        at most chunk values, see rangelist.points"""
+        sampled = rangelist((self,)).points(endpoint=endpoint,chunk=chunk)
+        if chunk is None:
+            return sampled.values
+        return (part.values for part in sampled)
+
+    def __bounds__(self):
+        """half-open (lo, hi) bounds of the values covered by the range"""
+        return (self._start,self._end+self._closed)
+
+    def __clip__(self,lo,hi):
+        """copy of self limited to the half-open bounds [lo, hi)
+
+        group, attributes and uuid are kept. A piece ending where self ends
+        keeps the closed flag of self, any other piece is closed at hi-1.
+        """
+        if (lo,hi) == self.__bounds__():
+            return self
+        if hi == self._end+self._closed:
+            end,closed = self._end,self._closed
+        else:
+            end,closed = hi-1,1
+        return self._make(lo,end,closed,self._group,self._attributes,self._uuid)
+
+    def __span__(self,other):
+        """new range from the start of self to the end of other
+
+        keeps the group and uuid of self, attributes are not carried over.
+        """
+        return self._make(self._start,other._end,other._closed,self._group,{},self._uuid)
+
     def extent(self):
         if isinstance(self,intrange):
             return self._end - self._start + self._closed
@@ -334,14 +1553,21 @@ class intrange(object):
             numeric=int
         elif isinstance(self,floatrange):
             numeric=float
-        same=all(isinstance(obj,(type(self),numeric)) for obj in (self,*args))
+        # frozen and plain ranges of a kind mix
+        kind = floatrange if isinstance(self,floatrange) else intrange
+        same=all(isinstance(obj,(kind,numeric)) for obj in (self,*args))
         if same:
             return True
         else:
             raise TypeError
 
-    def __group_attributes__(self,keys=None,with_uuid=False):
-        ''''''
+    def __group_attributes__(self,keys=None,with_uuid=False,interned=None):
+        '''copy of the range grouped by its group and the attributes in keys (all by default)
+
+        the new group is a namedtuple, with one class per field layout. With
+        `interned`, a dict shared across a collection, equal groups are built
+        once and shared, values of other types (True, 1, 1.0) are kept apart.
+        '''
         if keys:
             GroupBy = {k:v for k,v in self._attributes.items() if k in keys}
             LeftOverAttributes = {k:v for k,v in self._attributes.items() if k not in keys}
@@ -351,7 +1577,25 @@ class intrange(object):
         if with_uuid:
             GroupBy['uuid'] = self._uuid
         GroupBy['group'] = self._group
-        group = namedtuple("attributes",GroupBy.keys())(**GroupBy)
+        names,values = tuple(GroupBy),tuple(GroupBy.values())
+        group = None
+        if interned is not None:
+            # flat values and group items are told apart by their types,
+            # anything nested by _typed
+            types,inner = tuple(map(type,values[:-1])),tuple(map(type,self._group))
+            if any(map(_NESTED.__getitem__,types)) or any(map(_NESTED.__getitem__,inner)):
+                key = (names,_typed(values))
+            else:
+                key = (names,values,types,type(self._group),inner)
+            try:
+                group = interned.get(key)
+            except TypeError:
+                # unhashable attribute values are not shared
+                interned = None
+        if group is None:
+            group = _grouptuple(names)(*values)
+            if interned is not None:
+                interned[key] = group
         return type(self)(self._start,self._end,group=group,uuid=self._uuid,attributes=LeftOverAttributes)
 
     def __ungroup_attributes__(self):
@@ -364,45 +1608,64 @@ class intrange(object):
         return type(self)(self._start,self._end,group=group,attributes=D,uuid=self._uuid)
 
     ## operator overloading
+    def __comparison_keys__(self,other):
+        """keys of self and other for ordering
+
+        the cheap (group,start,end) keys decide, the common attributes are
+        only gathered when those tie.
+        """
+        s_key = (self._group,self._start,self._end)
+        o_key = (other._group,other._start,other._end)
+        if s_key == o_key:
+            return self.__comparison_key__(other),other.__comparison_key__(self)
+        return s_key,o_key
+
     def __lt__(self,other):
-        s_key = self.__comparison_key__(other)
-        o_key = other.__comparison_key__(self)
+        if not isinstance(other,intrange):
+            return NotImplemented
+        s_key,o_key = self.__comparison_keys__(other)
         return s_key < o_key
 
     def __gt__(self,other):
-        s_key = self.__comparison_key__(other)
-        o_key = other.__comparison_key__(self)
+        if not isinstance(other,intrange):
+            return NotImplemented
+        s_key,o_key = self.__comparison_keys__(other)
         return s_key > o_key
 
     def __le__(self,other):
-        s_key = self.__comparison_key__(other)
-        o_key = other.__comparison_key__(self)
+        if not isinstance(other,intrange):
+            return NotImplemented
+        s_key,o_key = self.__comparison_keys__(other)
         return s_key <= o_key
 
     def __ge__(self,other):
-        s_key = self.__comparison_key__(other)
-        o_key = other.__comparison_key__(self)
+        if not isinstance(other,intrange):
+            return NotImplemented
+        s_key,o_key = self.__comparison_keys__(other)
         return s_key >= o_key
 
     def __eq__(self,other):
-        ''''''
-        def equate(d1,d2):
-            k1 = set(d1.keys())
-            k2 = set(d2.keys())
-            if len(k1) == len(k2) == len(k2.union(k1)):
-                return all(d1[k] == d2[k] for k in k1)
-            else:
-                return False
-
+        '''same bounds, closedness, group and attributes'''
+        if not isinstance(other,intrange):
+            return NotImplemented
         eq = ((self._start == other._start) and
               (self._end == other._end) and
               (self._closed == other._closed) and
               (self._group == other._group) and
-              equate(self._attributes,other._attributes)
+              self._attributes == other._attributes
               )
 
         return eq
 
+    def __exact_key__(self):
+        """hashable tuple of the fields compared by ==, equal exactly when the ranges are"""
+        return (self._start,self._end,self._closed,self._group,_freeze(self._attributes))
+
+    def freeze(self):
+        """hashable, immutable copy sharing the uuid, see frozenintrange"""
+        return frozenintrange._make(self._start,self._end,self._closed,self._group,
+                                    self._attributes,self._uuid)
+
     def __sub__(self,other):
         '''difference of self from other'''
         if isinstance(other,(int,float)):
@@ -423,38 +1686,18 @@ class intrange(object):
                 result=rangelist()
                 if starts_in and not start_equal:
                     if isinstance(self,floatrange):
-                        new = floatrange(self._start,other._start,
-                                          step_size=self.step_size,
-                                          group=self._group,
-                                          attributes=self._attributes,
-                                          uuid=self._uuid
-                                         )
+                        new = self.__clip__(self._start,other._start)
                     elif isinstance(self,intrange):
-                        new = intrange(self._start,other._start-1,
-                                        closed=True,
-                                        group=self._group,
-                                        attributes=self._attributes,
-                                        uuid=self._uuid
-                                        )
+                        new = self._make(self._start,other._start-1,1,
+                                         self._group,self._attributes,self._uuid)
 
                     result.append(new)
                 if ends_in and not end_equal:
                     if isinstance(self,floatrange):
-                        new = floatrange(other._end+other._closed,
-                                        self._end,
-                                        step_size=self.step_size,
-                                        group=self._group,
-                                        attributes=self._attributes,
-                                        uuid=self._uuid
-                                        )
+                        new = self.__clip__(other._end+other._closed,self._end)
                     elif isinstance(self,intrange):
-                        new = intrange(other._end+other._closed,
-                                        self._end,
-                                        closed=self._closed,
-                                        group=self._group,
-                                        attributes=self._attributes,
-                                        uuid=self._uuid
-                                        )
+                        new = self._make(other._end+other._closed,self._end,self._closed,
+                                         self._group,self._attributes,self._uuid)
                     result.append(new)
                 return result
             else:
@@ -464,17 +1707,13 @@ class intrange(object):
         '''union of two ranges'''
         if isinstance(other,int):
             if isinstance(self,floatrange):
-                return floatrange(self._start+other,self._end+other,
-                              step_size=self.step_size,
-                              group=self._group,
-                              attributes=self._attributes,
-                              uuid=self._uuid)
+                return floatrange._make(self._start+other,self._end+other,
+                                        self.step_size,self._group,
+                                        self._attributes,self._uuid)
             elif isinstance(self,intrange):
-                return intrange(self._start+other,self._end+other,
-                              closed=self._closed,
-                              group=self._group,
-                              attributes=self._attributes,
-                              uuid=self._uuid)
+                return intrange._make(self._start+other,self._end+other,
+                                      self._closed,self._group,
+                                      self._attributes,self._uuid)
         elif self.__validranges__(other):
             result=rangelist()
             adjacent=(self.__adjoins__(other) or other.__adjoins__(self))
@@ -524,8 +1763,7 @@ class intrange(object):
     ## outputs
     def _astuple(self):
         names=("start","end","uuid")+tuple(self._attributes.keys())
-        rangeTuple=namedtuple('rangeTuple',names)
-        return rangeTuple(self._start,self._end,self._uuid,*self._attributes.values())
+        return _rangetuple(names)(self._start,self._end,self._uuid,*self._attributes.values())
 
 ##
 class floatrange(intrange):
@@ -546,6 +1784,8 @@ class floatrange(intrange):
     :param attributes: any other properties associated with the range
     :type attributes: dict
     """
+    __slots__ = ("step_size",)
+
     def __init__(self,min_val,max_val,step_size=0.1,group=(1,),attributes={},uuid=None):
         self._start=float(min(min_val,max_val))
         self._end=float(max(min_val,max_val))
@@ -553,14 +1793,42 @@ class floatrange(intrange):
         self._closed=0
         self._group=group
         self._attributes=attributes
-        self._uuid = uuid or uuid4()
-        assert isinstance(self._uuid,UUID), "attribute 'uuid' must be a UUID instance"
+        self._uid = uuid
+        assert uuid is None or isinstance(uuid,UUID), "attribute 'uuid' must be a UUID instance"
         assert "group" not in attributes,"reserved keyword 'group' should not be in attributes"
         assert "uuid" not in attributes,"reserved keyword 'uuid' should not be in attributes"
 
+    def __reduce__(self):
+        return (_restore,(type(self),self._start,self._end,self.step_size,
+                          self._group,self._attributes,self._uuid.int))
+
+    @classmethod
+    def _make(cls,start,end,step_size,group,attributes,uuid):
+        """build a range from trusted values, skipping the checks of __init__"""
+        self = object.__new__(cls)
+        self._start = start
+        self._end = end
+        self.step_size = step_size
+        self._closed = 0
+        self._group = group
+        self._attributes = attributes
+        self._uid = uuid
+        return self
+
 
     def __len__(self):
-        return (self._end-self._start)//self.step_size
+        """number of values yielded by iteration, see points"""
+        return int((self._end-self._start)/self.step_size + _STEP_TOLERANCE) + 1
+
+    def __span__(self,other):
+        """new range from the start of self to the end of other"""
+        return self._make(self._start,other._end,self.step_size,self._group,{},self._uuid)
+
+    def __clip__(self,lo,hi):
+        """copy of self limited to the bounds [lo, hi)"""
+        if (lo,hi) == self.__bounds__():
+            return self
+        return self._make(lo,hi,self.step_size,self._group,self._attributes,self._uuid)
 
     def extent(self):
         '''
@@ -585,12 +1853,27 @@ class floatrange(intrange):
             return starts_in or ends_in
 
     def __iter__(self):
-        # enable iteration over your object
-        # (assume step size is 1)
-        n=self._start
-        while n <=self._end:
-            yield(n)
-            n+=self.step_size
+        """start + k*step for every k up to the end, see points"""
+        step = self.step_size
+        for k in range(len(self)):
+            value = self._start + k*step
+            # the end is given exactly when a step lands on it
+            yield self._end if abs(value - self._end) <= _STEP_TOLERANCE*step else value
+
+    def points(self,endpoint=True,chunk=None):
+        """values start + k*step as a NumPy array
+
+        the end is included when a step lands on it (within 1e-9 steps), and
+        then given exactly, as in iteration. endpoint=False samples the
+        half-open [start, end) used by the set operations instead. With chunk
+        a generator of arrays of at most chunk values is returned.
+        """
+        return super().points(endpoint=endpoint,chunk=chunk)
+
+    def freeze(self):
+        """hashable, immutable copy sharing the uuid, see frozenfloatrange"""
+        return frozenfloatrange._make(self._start,self._end,self.step_size,self._group,
+                                      self._attributes,self._uuid)
 
     def __repr__(self):
         '''string representing constructor for the object'''
@@ -610,6 +1893,90 @@ class floatrange(intrange):
         # A=self._attributes
         return f"floatrange({S},{E},group={G})"
 
+##
+class _frozen(object):
+    """hashing shared by frozenintrange and frozenfloatrange"""
+    __slots__ = ()
+
+    def __init__(self,*args,**kwargs):
+        super().__init__(*args,**kwargs)
+        self.__freeze__()
+
+    @classmethod
+    def _make(cls,*args):
+        """see intrange._make, the fields are set past __setattr__"""
+        self = object.__new__(cls)
+        set_field = object.__setattr__
+        for name,value in zip(cls.__fields__,args):
+            set_field(self,name,value)
+        for name,value in cls.__constants__:
+            set_field(self,name,value)
+        self.__freeze__()
+        return self
+
+    def __freeze__(self):
+        """make the attributes read-only and compute the key and hash, once"""
+        set_field = object.__setattr__
+        set_field(self,"_attributes",_frozendict(self._attributes))
+        set_field(self,"_key",super().__exact_key__())
+        set_field(self,"_hash",hash(self._key))
+
+    def __setattr__(self,name,value):
+        # fields are assigned while building, until __freeze__ sets the hash
+        if hasattr(self,"_hash"):
+            raise AttributeError(f"{type(self).__name__} is immutable, cannot set {name}")
+        object.__setattr__(self,name,value)
+
+    def __delattr__(self,name):
+        raise AttributeError(f"{type(self).__name__} is immutable, cannot delete {name}")
+
+    @property
+    def _uuid(self):
+        """uuid of the range, generated on first read"""
+        if self._uid is None:
+            object.__setattr__(self,"_uid",uuid4())
+        return self._uid
+
+    def __exact_key__(self):
+        return self._key
+
+    def __hash__(self):
+        return self._hash
+
+    def __eq__(self,other):
+        if isinstance(other,_frozen):
+            return self._hash == other._hash and self._key == other._key
+        return super().__eq__(other)
+
+    def freeze(self):
+        return self
+
+class frozenintrange(_frozen,intrange):
+    """Hashable, immutable intrange.
+
+    the attributes become a read-only dict and the hash over start, end,
+    closedness, group and attribute values is computed once at construction,
+    so frozen ranges can be set members and dict keys. Equality is that of
+    intrange, decided from the stored key between frozen ranges. Attribute
+    values must be hashable or lists, tuples, sets and dicts of hashable
+    values. Assigning or deleting a field raises AttributeError.
+
+    Examples:
+        >>> A = intrange(1,5,attributes={"k":1}).freeze()
+        >>> A in {intrange(1,5,attributes={"k":1}).freeze()}
+        True
+    """
+    __slots__ = ("_key","_hash")
+    # fields set by _make, in the order of its arguments
+    __fields__ = ("_start","_end","_closed","_group","_attributes","_uid")
+    __constants__ = ()
+
+class frozenfloatrange(_frozen,floatrange):
+    """Hashable, immutable floatrange, see frozenintrange."""
+    __slots__ = ("_key","_hash")
+    __fields__ = ("_start","_end","step_size","_group","_attributes","_uid")
+    __constants__ = (("_closed",0),)
+
 ##
 if __name__ == "__main__":
     ## TEMP TESTING BLOCK
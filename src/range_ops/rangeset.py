@@ -0,0 +1,312 @@
+from bisect import bisect_left, bisect_right
+
+from .rangers import rangelist, intrange, floatrange, _from_bounds
+
+## helpers
+LOAD = 256
+_INF = float("inf")
+
+def _widest(block):
+    """widest gap between consecutive spans of a block"""
+    return max((block[n+1][0] - block[n][1] for n in range(len(block)-1)),default=0)
+
+def _first_at_least(tree,node,nlo,nhi,lo,length):
+    """first leaf index >= lo of a max segment tree holding at least length, or -1"""
+    if nhi <= lo or tree[node] < length:
+        return -1
+    if nhi - nlo == 1:
+        return nlo
+    mid = (nlo + nhi)//2
+    found = _first_at_least(tree,2*node,nlo,mid,lo,length)
+    if found < 0:
+        found = _first_at_least(tree,2*node+1,mid,nhi,lo,length)
+    return found
+
+class _spans(object):
+    '''disjoint sorted half-open (lo, hi) spans of one group
+
+    the spans are cut into blocks of about LOAD items, with the first start
+    and the widest inner gap (filled in lazily) of every block cached. Lookups bisect the block
+    starts and then the block, edits rebuild only the blocks they touch.
+
+    a max segment tree over the blocks holds the room of each block, the
+    widest of its inner gap and the gap before it, so first_gap finds the
+    next block with room in O(log n). Edits inside a block mark it and the
+    next block dirty, the tree paths are refreshed on the next query. Edits
+    that change the blocks (already O(n/LOAD) list edits) drop the tree, it
+    is rebuilt on the next query.
+    '''
+    __slots__ = ("blocks","firsts","gaps","size","tree","cap","dirty")
+
+    def __init__(self,los=(),his=()):
+        spans = list(zip(los,his))
+        self.blocks,self.firsts,self.gaps = [],[],[]
+        self.size = 0
+        self.tree,self.cap,self.dirty = None,0,set()
+        if spans:
+            self.splice(0,0,-1,-1,spans)
+
+    def __iter__(self):
+        for block in self.blocks:
+            yield from block
+
+    def locate(self,x,strict=False):
+        '''(block, index) of the last span starting at or before x (before x if strict)
+
+        index is -1 when no span qualifies.
+        '''
+        cut = bisect_left if strict else bisect_right
+        b = cut(self.firsts,x) - 1
+        if b < 0:
+            return 0,-1
+        return b,cut(self.blocks[b],(x,-_INF if strict else _INF)) - 1
+
+    def after(self,b,i):
+        '''position following (b, i), moved to the next block at a block end'''
+        i += 1
+        if i == len(self.blocks[b]) and b + 1 < len(self.blocks):
+            return b + 1,0
+        return b,i
+
+    def splice(self,b1,i1,b2,i2,new):
+        '''replace the spans from (b1, i1) through (b2, i2) by the list new'''
+        blocks = self.blocks
+        if blocks and b1 == b2:
+            block = blocks[b1]
+            size = len(block) - (i2 + 1 - i1) + len(new)
+            if 0 < size <= 2*LOAD and (size >= LOAD//2 or len(blocks) == 1):
+                # edit in place, the widest gap is recomputed when needed
+                block[i1:i2+1] = new
+                self.firsts[b1] = block[0][0]
+                self.gaps[b1] = None
+                self.size += len(new) - (i2 + 1 - i1)
+                # the room of the next block starts at this block's end
+                self.dirty.update((b1,b1 + 1))
+                return
+        if not blocks:
+            merged = new
+            b2 = -1
+        else:
+            merged = blocks[b1][:i1] + new + blocks[b2][i2+1:]
+            self.size -= sum(len(block) for block in blocks[b1:b2+1])
+            # fold small leftovers into the next block
+            if len(merged) < LOAD//2 and b2 + 1 < len(blocks):
+                b2 += 1
+                self.size -= len(blocks[b2])
+                merged += blocks[b2]
+        if len(merged) > 2*LOAD:
+            parts = [merged[n:n+LOAD] for n in range(0,len(merged),LOAD)]
+        else:
+            parts = [merged] if merged else []
+        blocks[b1:b2+1] = parts
+        self.firsts[b1:b2+1] = [part[0][0] for part in parts]
+        self.gaps[b1:b2+1] = [None]*len(parts)
+        self.size += len(merged)
+        self.tree = None
+
+    def add(self,lo,hi):
+        if not self.blocks:
+            return self.splice(0,0,-1,-1,[(lo,hi)])
+        b,i = self.locate(lo)
+        if i < 0 or self.blocks[b][i][1] < lo:
+            b,i = self.after(b,i)
+        eb,ei = self.locate(hi)
+        if (b,i) <= (eb,ei):
+            # overlapping or adjoining spans are absorbed
+            lo = min(lo,self.blocks[b][i][0])
+            hi = max(hi,self.blocks[eb][ei][1])
+        self.splice(b,i,eb,ei,[(lo,hi)])
+
+    def discard(self,lo,hi):
+        if not self.blocks or hi <= lo:
+            return
+        b,i = self.locate(lo)
+        if i < 0 or self.blocks[b][i][1] <= lo:
+            b,i = self.after(b,i)
+        eb,ei = self.locate(hi,strict=True)
+        if (b,i) > (eb,ei):
+            return
+        first_lo = self.blocks[b][i][0]
+        last_hi = self.blocks[eb][ei][1]
+        keep = []
+        if first_lo < lo:
+            keep.append((first_lo,lo))
+        if last_hi > hi:
+            keep.append((hi,last_hi))
+        self.splice(b,i,eb,ei,keep)
+
+    def covers(self,lo,hi):
+        b,i = self.locate(lo)
+        return i >= 0 and hi <= self.blocks[b][i][1] and lo < self.blocks[b][i][1]
+
+    ## room of the blocks
+    def __room__(self,b):
+        '''widest gap inside block b or between it and the previous block'''
+        if self.gaps[b] is None:
+            self.gaps[b] = _widest(self.blocks[b])
+        if b == 0:
+            return self.gaps[b]
+        return max(self.gaps[b],self.firsts[b] - self.blocks[b-1][-1][1])
+
+    def __refresh__(self):
+        '''bring the segment tree up to date with the blocks'''
+        if self.tree is None:
+            cap = 1
+            while cap < len(self.blocks):
+                cap *= 2
+            tree = [-_INF]*(2*cap)
+            tree[cap:cap+len(self.blocks)] = map(self.__room__,range(len(self.blocks)))
+            for node in range(cap - 1,0,-1):
+                tree[node] = max(tree[2*node],tree[2*node+1])
+            self.tree,self.cap = tree,cap
+        else:
+            tree = self.tree
+            for b in self.dirty:
+                if b < len(self.blocks):
+                    node = self.cap + b
+                    tree[node] = self.__room__(b)
+                    node //= 2
+                    while node:
+                        tree[node] = max(tree[2*node],tree[2*node+1])
+                        node //= 2
+        self.dirty.clear()
+
+    def first_gap(self,length,start):
+        b,i = self.locate(start)
+        x = start
+        if i >= 0:
+            x = max(x,self.blocks[b][i][1])
+        i += 1
+        blocks = self.blocks
+        # x may lie past the end of this block, so it and the next one are scanned
+        stop = min(b + 2,len(blocks))
+        while b < stop:
+            for lo,hi in blocks[b][i:]:
+                if lo - x >= length:
+                    return x
+                x = hi
+            b,i = b + 1,0
+        if b == len(blocks):
+            return x
+        # x is now the end of block b - 1, the room of the blocks applies
+        self.__refresh__()
+        b = _first_at_least(self.tree,1,0,self.cap,b,length)
+        if b < 0:
+            return blocks[-1][-1][1]
+        x = blocks[b-1][-1][1]
+        for lo,hi in blocks[b]:
+            if lo - x >= length:
+                return x
+            x = hi
+        return x
+
+## classes
+class rangeset(object):
+    """Mutable union of ranges, kept merged and sorted per group.
+
+    adding a range absorbs every range of its group it overlaps or adjoins,
+    discarding one removes the bounds it covers (set semantics, overlapping
+    additions are not counted). Ranges are stored as half-open bounds in a
+    blocked sorted list, so add, discard, containment and first_gap locate
+    their position with bisect in O(log n) and only edit one or a few blocks.
+
+    the merged ranges are rebuilt on iteration without attributes, in the
+    kind of the first range added to their group.
+
+    :param ranges: initial ranges, merged in bulk
+    :type ranges: rangelist, or any iterable of intrange/floatrange
+
+    Examples:
+        >>> S = rangeset((intrange(1,5),intrange(8,10)))
+        >>> S.add(intrange(6,7))
+        >>> list(S)
+        [intrange(1,10,closed=True,group=(1,))]
+        >>> S.discard(intrange(4,5))
+        >>> S.first_gap(3,start=0)
+        11
+    """
+
+    def __init__(self,ranges=()):
+        ranges = rangelist(ranges)
+        self._groups = {}
+        self._like = {}
+        for r in ranges:
+            self._like.setdefault(r._group,r)
+        for grp,(los,his) in rangelist.__covered__(ranges).items():
+            self._groups[grp] = _spans(los,his)
+
+    def __repr__(self):
+        return f"rangeset(groups={len(self._groups)},ranges={len(self)})"
+
+    def __len__(self):
+        return sum(spans.size for spans in self._groups.values())
+
+    def __iter__(self):
+        for grp,spans in self._groups.items():
+            like = self._like[grp]
+            for lo,hi in spans:
+                yield _from_bounds(like,lo,hi,grp)
+
+    def __contains__(self,item):
+        """range fully covered, or a point of group (1,), see contains"""
+        if isinstance(item,(intrange,floatrange)):
+            lo,hi = item.__bounds__()
+            spans = self._groups.get(item._group)
+            return spans is not None and spans.covers(lo,hi)
+        return self.contains(item)
+
+    def contains(self,value,group=(1,)):
+        """whether the point value lies in the set for group"""
+        spans = self._groups.get(group)
+        return spans is not None and spans.covers(value,value)
+
+    def groups(self):
+        """groups holding at least one range"""
+        return list(self._groups)
+
+    def to_rangelist(self):
+        return rangelist(self)
+
+    def add(self,r):
+        """merge range r into the set"""
+        lo,hi = r.__bounds__()
+        if hi <= lo:
+            return
+        if r._group not in self._groups:
+            self._groups[r._group] = _spans()
+            self._like[r._group] = r
+        self._groups[r._group].add(lo,hi)
+
+    def update(self,ranges):
+        for r in ranges:
+            self.add(r)
+
+    def discard(self,r):
+        """remove the bounds of range r from the set, if present"""
+        spans = self._groups.get(r._group)
+        if spans is None:
+            return
+        spans.discard(*r.__bounds__())
+        if not spans.size:
+            del self._groups[r._group]
+            del self._like[r._group]
+
+    def remove(self,r):
+        """like discard, raises KeyError unless r is fully covered"""
+        if r not in self:
+            raise KeyError(r)
+        self.discard(r)
+
+    def first_gap(self,length,start,group=(1,)):
+        """start of the first free stretch of the given length at or after start
+
+        the stretch [x, x + length) holds no range of group. For int ranges a
+        length of L leaves room for intrange(x, x + L - 1).
+
+        :return: x
+        :rtype: int|float
+        """
+        spans = self._groups.get(group)
+        if spans is None:
+            return start
+        return spans.first_gap(length,start)
@@ -0,0 +1,93 @@
+from heapq import merge as _heapmerge
+
+## helpers
+def _stream_key(r):
+    """(group, start) order expected from every stream"""
+    return (r._group,r._start)
+
+def _checked(ranges):
+    """yield (range, lo, hi, new_group), raising ValueError on unsorted input
+
+    ranges must arrive grouped, with the starts of a group non-decreasing.
+    Only the groups already passed are remembered.
+    """
+    seen = set()
+    group = last_lo = None
+    for r in ranges:
+        lo,hi = r.__bounds__()
+        new_group = not seen or r._group != group
+        if new_group:
+            if r._group in seen:
+                raise ValueError(f"group {r._group} is not contiguous in the stream")
+            seen.add(r._group)
+            group = r._group
+        elif lo < last_lo:
+            raise ValueError(f"{r!r} starts before the previous range of its group")
+        last_lo = lo
+        yield r,lo,hi,new_group
+
+## streams
+def merge_stream(ranges):
+    """consolidate adjacent/overlapping ranges of a sorted stream
+
+    lazy counterpart of rangelist.merge for input sorted by (group, start),
+    only the current run is held in memory.
+
+    :param ranges: iterable of intrange/floatrange sorted by group then start
+    :return: generator of merged ranges, in input order
+    """
+    first = last = None
+    for r,lo,hi,new_group in _checked(ranges):
+        if new_group and first is not None:
+            # flushed here, an empty range may open the group
+            yield first if last is first else first.__span__(last)
+            first = None
+        if hi <= lo:
+            continue
+        if first is not None and lo <= run_hi:
+            if hi > run_hi:
+                if last is first and lo == run_lo:
+                    # a wider range sharing the start covers the run alone
+                    first = r
+                last,run_hi = r,hi
+            continue
+        if first is not None:
+            yield first if last is first else first.__span__(last)
+        first = last = r
+        run_lo,run_hi = lo,hi
+    if first is not None:
+        yield first if last is first else first.__span__(last)
+
+def unique_stream(ranges):
+    """remove duplicate range parts of a sorted stream
+
+    lazy counterpart of rangelist.unique for input sorted by (group, start):
+    ranges earlier in the stream are preferred, so each range keeps the part
+    beyond the furthest end seen so far in its group, ties are broken by
+    stream order. The default rangelist.unique also ranks ties on (group,
+    start, end) by closedness and attributes, so only a stream in full
+    sorted() order gives its result.
+
+    :param ranges: iterable of intrange/floatrange sorted by group then start
+    :return: generator of unique range pieces
+    """
+    reach = None
+    for r,lo,hi,new_group in _checked(ranges):
+        if new_group:
+            reach = lo
+        start = max(lo,reach)
+        if hi > start:
+            yield r.__clip__(start,hi)
+            reach = hi
+
+def merge_sources(*sources):
+    """k-way merge of several sorted streams into one sorted stream
+
+    each source must be sorted by (group, start), e.g. one per day file.
+    A heap holds one pending range per source.
+
+    Examples:
+        >>> days = (read_day(d) for d in dates)
+        >>> merged = merge_stream(merge_sources(*days))
+    """
+    return _heapmerge(*sources,key=_stream_key)
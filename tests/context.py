@@ -1,4 +1,4 @@
 import os
 import sys
-sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..',"src","range_ops")))
-import rangers
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..',"src")))
+from range_ops import rangers
@@ -78,6 +78,468 @@ class TestFloatRange(unittest.TestCase):
                          rangelist((floatrange(8.0,10.0,group=(1,)),)),
                          msg=None)
 
+class TestPoints(unittest.TestCase):
+
+    def test_float_len_matches_iteration(self):
+        for r in (floatrange(0,1,0.1),floatrange(0.3,1.7,0.1),floatrange(0,10,1/3),
+                  floatrange(0,0.95,0.1),floatrange(2,2)):
+            with self.subTest(r=r):
+                values = list(r)
+                self.assertEqual(len(values),len(r))
+                self.assertEqual(values,r.points().tolist())
+        self.assertEqual(list(floatrange(0,1,0.1))[-1],1.0)
+        self.assertEqual(floatrange(0,1,0.25).points(endpoint=False).tolist(),[0,0.25,0.5,0.75])
+
+    def test_int_points_and_chunks(self):
+        self.assertEqual(intrange(1,5,closed=False).points().tolist(),[1,2,3,4])
+        self.assertEqual([c.tolist() for c in intrange(1,5).points(chunk=2)],[[1,2],[3,4],[5]])
+
+    def test_rangelist_points(self):
+        R = rangelist((intrange(1,3),floatrange(0,1,0.25,group=(2,)),intrange(5,5,closed=False)))
+        P = R.points()
+        self.assertEqual(P.values.tolist(),[1,2,3,0,0.25,0.5,0.75,1])
+        self.assertEqual(P.segments.tolist(),[0,0,0,1,1,1,1,1])
+        self.assertEqual([P.groups[c] for c in P.codes],[(1,)]*3 + [(2,)]*5)
+        chunks = list(R.points(chunk=3))
+        self.assertEqual([len(c.values) for c in chunks],[3,3,2])
+        self.assertEqual(sum((c.segments.tolist() for c in chunks),[]),P.segments.tolist())
+
+class TestRangeObjects(unittest.TestCase):
+
+    def test_uuid_not_shared(self):
+        self.assertNotEqual(intrange(1,2)._uuid,intrange(1,2)._uuid)
+
+    def test_lazy_uuid_kept_by_pieces(self):
+        A = intrange(1,10)
+        pieces = A - intrange(4,5)
+        self.assertEqual(len(pieces),2)
+        self.assertTrue(all(p._uuid == A._uuid for p in pieces))
+
+    def test_slots_and_pickle(self):
+        import pickle
+        A = floatrange(1,2,step_size=0.5,attributes={"k":1})
+        self.assertFalse(hasattr(A,"__dict__"))
+        B = pickle.loads(pickle.dumps(A))
+        self.assertEqual(A,B)
+        self.assertEqual((A._uuid,A.step_size),(B._uuid,B.step_size))
+
+class TestRangeListUnique(unittest.TestCase):
+
+    def test_unique_float(self):
+        R = rangelist((floatrange(1,10),floatrange(5,15),floatrange(12,13),floatrange(20,25)))
+        self.assertEqual(R.unique(),
+                         rangelist((floatrange(1,10),floatrange(10,15),floatrange(20,25))))
+
+    def test_unique_int_open(self):
+        A = intrange(6,14,closed=False)
+        B = intrange(14,25)
+        C = intrange(10,20)
+        U = rangelist((A,B,C)).unique()
+        self.assertEqual(U,rangelist((A,intrange(14,20),intrange(21,25))))
+        self.assertEqual(rangelist((B,A)).unique(),rangelist((A,B)))
+
+    def test_unique_sort_key_priority(self):
+        A = floatrange(0,10,attributes={"rank":2})
+        B = floatrange(4,6,attributes={"rank":1})
+        R = rangelist((A,B),__sort_key__=lambda r:r._attributes["rank"])
+        U = R.unique()
+        self.assertEqual(U,rangelist((B,floatrange(0,4,attributes={"rank":2}),
+                                        floatrange(6,10,attributes={"rank":2}))))
+        self.assertTrue(all(u._uuid == A._uuid for u in U[1:]))
+
+class TestRangeListMerge(unittest.TestCase):
+
+    def test_merge_adjoining_int(self):
+        R = rangelist((intrange(5,8),intrange(0,4),intrange(10,12,closed=False),intrange(9,9)))
+        self.assertEqual(R.merge(),rangelist((intrange(0,12,closed=False),)))
+
+    def test_merge_groups(self):
+        R = rangelist((floatrange(0,5,group=("a",)),floatrange(5,8,group=("a",)),
+                       floatrange(2,3,group=("b",)),floatrange(9,10,group=("a",))))
+        self.assertEqual(R.merge(),rangelist((floatrange(0,8,group=("a",)),
+                                              floatrange(9,10,group=("a",)),
+                                              floatrange(2,3,group=("b",)))))
+
+    def test_merge_contained_keeps_range(self):
+        A = floatrange(0,10,attributes={"k":1})
+        R = rangelist((floatrange(2,4),A,floatrange(3,10)))
+        self.assertIs(R.merge()[0],A)
+
+class TestRangeListDisect(unittest.TestCase):
+
+    def test_disect_float(self):
+        A = floatrange(4,15,attributes={"k":1})
+        B = floatrange(6,12)
+        D = rangelist((A,B)).disect()
+        self.assertEqual(D,rangelist((floatrange(4,6,attributes={"k":1}),
+                                      floatrange(6,12,attributes={"k":1}),
+                                      floatrange(12,15,attributes={"k":1}),
+                                      B)))
+        self.assertTrue(all(d._uuid == A._uuid for d in D[:3]))
+
+    def test_disect_int_keeps_cut_points(self):
+        R = rangelist((intrange(1,10),intrange(5,15),intrange(20,25,closed=False)))
+        self.assertEqual(R.disect(),rangelist((intrange(1,4),intrange(5,10),
+                                               intrange(5,10),intrange(11,15),
+                                               intrange(20,25,closed=False))))
+
+class TestRangeListDepth(unittest.TestCase):
+
+    def test_duplicates(self):
+        A = floatrange(0,10,attributes={"k":1})
+        B = floatrange(5,15)
+        C = floatrange(6,8,group=(2,))
+        D = rangelist((B,A,C)).duplicates()
+        self.assertEqual(D,rangelist((floatrange(5,10),)))
+        self.assertEqual(D[0]._uuid,B._uuid)
+
+    def test_duplicates_int_contained(self):
+        R = rangelist((intrange(15,20),intrange(16,20,closed=False),intrange(1,3)))
+        self.assertEqual(R.duplicates(),rangelist((intrange(16,20,closed=False),)))
+
+    def test_depth_profile(self):
+        R = rangelist((intrange(1,4),intrange(3,6),intrange(5,5,closed=False),
+                       intrange(8,9,group=(2,))))
+        self.assertEqual(R.depth_profile(),{(1,):[(1,3,1),(3,5,2),(5,7,1)],
+                                            (2,):[(8,10,1)]})
+
+    def test_coverage(self):
+        R = rangelist((floatrange(0,4),floatrange(2,6),floatrange(4,8),floatrange(20,21)))
+        self.assertEqual(R.coverage(),rangelist((floatrange(0,8),floatrange(20,21))))
+        self.assertEqual(R.coverage(2),rangelist((floatrange(2,6),)))
+        self.assertEqual(R.coverage(3),rangelist())
+        I = rangelist((intrange(1,10),intrange(5,15),intrange(8,20)))
+        self.assertEqual(I.coverage(3),rangelist((intrange(8,10),)))
+
+class TestRangeListCache(unittest.TestCase):
+
+    def test_repeated_calls_are_cached(self):
+        R = rangelist((floatrange(1,10),floatrange(5,15)))
+        # the second call reuses the clipped ranges of the first
+        self.assertIs(R.unique()[1],R.unique()[1])
+        self.assertIs(R.groupdict()[(1,)][0],R.groupdict()[(1,)][0])
+        self.assertNotEqual(R.unique(),R.merge())
+
+    def test_cached_results_are_not_shared(self):
+        R = rangelist((floatrange(1,10),floatrange(5,15),floatrange(2,3,group=(2,))))
+        a,b = R.merge(),R.merge()
+        self.assertIsNot(a,b)
+        a.append(floatrange(40,50))
+        self.assertEqual(b,R.merge())
+        self.assertEqual(len(R.merge()),2)
+        g = R.groupdict()
+        g[(1,)].append(floatrange(40,50))
+        g[(3,)] = rangelist()
+        self.assertEqual(len(R.groupdict()[(1,)]),2)
+        self.assertNotIn((3,),R.groupdict())
+
+    def test_mutations_invalidate(self):
+        R = rangelist((floatrange(1,10),floatrange(5,15)))
+        for mutate in (lambda:R.append(floatrange(20,30)),
+                       lambda:R.extend([floatrange(40,50)]),
+                       lambda:R.__setitem__(0,floatrange(0,10)),
+                       lambda:R.pop(),
+                       lambda:R.__delitem__(0),
+                       lambda:R.__iadd__([floatrange(1,3)]),
+                       lambda:R.sort()):
+            before = R.merge()
+            mutate()
+            self.assertIsNot(R.merge(),before)
+            self.assertEqual(R.merge(),rangelist(R).merge())
+
+    def test_modified_result_and_sort_key(self):
+        R = rangelist((floatrange(0,10,attributes={"rank":2}),floatrange(4,6,attributes={"rank":1})))
+        U = R.unique()
+        U.append(floatrange(50,60))
+        self.assertEqual(len(R.unique()),1)
+        R.__sort_key__ = lambda r:r._attributes["rank"]
+        self.assertEqual(len(R.unique()),3)
+
+    def test_disabled(self):
+        R = rangelist((floatrange(1,10),))
+        R.cache_size = 0
+        self.assertIsNot(R.unique(),R.unique())
+        import pickle
+        self.assertEqual(pickle.loads(pickle.dumps(R)),R)
+
+class TestRangeListSort(unittest.TestCase):
+
+    def test_sort_matches_comparisons(self):
+        import random
+        rnd = random.Random(0)
+        R = rangelist(intrange(a,a+rnd.randint(0,3),group=(rnd.randint(0,2),),
+                               attributes={"k":rnd.randint(0,2)})
+                      for a in (rnd.randint(0,10) for _ in range(200)))
+        S = rangelist(R)
+        S.sort()
+        self.assertEqual([r._uuid for r in S],[r._uuid for r in sorted(R)])
+        self.assertTrue(all(not b < a for a,b in zip(S,S[1:])))
+        self.assertTrue(intrange(1,5,attributes={"k":1}) < intrange(1,5,attributes={"k":2}))
+        self.assertTrue(intrange(1,5,attributes={"k":3}) >= intrange(1,5))
+        with self.assertRaises(TypeError):
+            intrange(1,5) < 3
+
+    def test_sortedness_is_tracked(self):
+        R = rangelist((floatrange(5,9),floatrange(1,3),floatrange(0,2,group=(2,))))
+        self.assertFalse(R.is_sorted())
+        R.sort()
+        self.assertTrue(R.is_sorted())
+        version = R._version
+        R.sort()
+        self.assertEqual(R._version,version)
+        self.assertTrue(R.groupdict()[(1,)].__known_sorted__())
+        R.append(floatrange(0,1))
+        self.assertFalse(R.__known_sorted__())
+        self.assertFalse(R.is_sorted())
+        R.sort(key=lambda r:-r._start)
+        self.assertFalse(R.__known_sorted__())
+        self.assertEqual(rangelist(sorted(R)).unique(),R.unique())
+
+class TestGroupEncoding(unittest.TestCase):
+
+    def test_group_codes_and_groupdict(self):
+        R = rangelist((floatrange(0,1,group=("b",)),floatrange(0,1,group=("a",)),
+                       floatrange(2,3,group=("b",)),floatrange(4,5,group=("c",))))
+        self.assertEqual(R.__group_codes__(),([0,1,0,2],[("b",),("a",),("c",)]))
+        gd = R.groupdict()
+        self.assertEqual(list(gd),[("b",),("a",),("c",)])
+        self.assertEqual([r._start for r in gd[("b",)]],[0,2])
+        R.sort()
+        self.assertEqual([r._group for r in R],[("a",),("b",),("b",),("c",)])
+
+    def test_group_attributes_are_interned(self):
+        R = rangelist(floatrange(n,n+1,attributes={"k":n%2,"tag":"x"}) for n in range(6))
+        A = R.__group_attributes__(keys=("k",))
+        self.assertIs(A[0]._group,A[2]._group)
+        self.assertIsNot(A[0]._group,A[1]._group)
+        self.assertIs(type(A[0]._group),type(A[1]._group))
+        self.assertEqual(A[1]._group.k,1)
+        self.assertEqual(A[1]._attributes,{"tag":"x"})
+        self.assertEqual(len(A.groupdict()),2)
+        self.assertEqual(A.__ungroup_attributes__()[3]._attributes,{"k":1,"tag":"x"})
+
+    def test_columns_share_groups(self):
+        import pandas as pd
+        df = pd.DataFrame({"s":[1,2,3],"e":[4,5,6],"g":["x","y","x"]})
+        R = rangelist.from_dataframe(df,"s","e",["g"])
+        self.assertIs(R[0]._group,R[2]._group)
+
+    def test_interning_keeps_value_types(self):
+        import pandas as pd
+        values = [True,1,1.0]
+        R = rangelist(floatrange(n,n+1,attributes={"flag":v}) for n,v in enumerate(values))
+        back = R.__group_attributes__().__ungroup_attributes__()
+        self.assertEqual([type(r._attributes["flag"]) for r in back],[bool,int,float])
+        df = pd.DataFrame({"s":[1,2,3],"e":[4,5,6],"g":pd.Series(values,dtype=object)})
+        R = rangelist.from_dataframe(df,"s","e",["g"])
+        self.assertEqual([type(r._group[0]) for r in R],[bool,int,float])
+
+class TestFrozenRanges(unittest.TestCase):
+
+    def test_hash_and_equality(self):
+        A = intrange(1,5,attributes={"tags":["a"],"k":{"x":1}})
+        F = A.freeze()
+        self.assertIsInstance(F,rangers.frozenintrange)
+        self.assertEqual((F,F._uuid),(A,A._uuid))
+        self.assertIs(F.freeze(),F)
+        same = intrange(1,5,attributes={"tags":["a"],"k":{"x":1}}).freeze()
+        self.assertEqual(len({F,same}),1)
+        self.assertNotIn(intrange(1,5,attributes={"tags":("a",),"k":{"x":1}}).freeze(),{F})
+        self.assertNotIn(intrange(1,5,closed=False).freeze(),{intrange(1,5).freeze()})
+        with self.assertRaises(TypeError):
+            F._attributes["k"] = 2
+        with self.assertRaises(TypeError):
+            hash(intrange(1,5))
+        X = floatrange(1,3,group=(2,)).freeze()
+        self.assertIn(floatrange(1,3,group=(2,)).freeze(),{X:1})
+
+    def test_fields_are_immutable(self):
+        F = intrange(1,5).freeze()
+        for name,value in (("_start",100),("_group",(2,)),("_uid",None),("_hash",0)):
+            with self.assertRaises(AttributeError):
+                setattr(F,name,value)
+        with self.assertRaises(AttributeError):
+            del F._end
+        self.assertEqual((F._start,F._end),(1,5))
+        self.assertNotIn(intrange(100,5).freeze(),{F})
+        X = rangers.frozenfloatrange(1,3,step_size=0.5)
+        with self.assertRaises(AttributeError):
+            X.step_size = 1
+        # the uuid is still generated on first read
+        self.assertEqual(X._uuid,X._uuid)
+        self.assertEqual(X,floatrange(1,3,step_size=0.5))
+
+    def test_operations_and_pickle(self):
+        import pickle
+        F = intrange(1,10,attributes={"k":1}).freeze()
+        self.assertEqual(F * intrange(5,20),intrange(5,10))
+        self.assertIsInstance(F.__clip__(2,4),rangers.frozenintrange)
+        G = pickle.loads(pickle.dumps(F))
+        self.assertEqual((G,hash(G),G._uuid),(F,hash(F),F._uuid))
+        self.assertEqual(rangelist((F,intrange(8,12).freeze())).merge(),
+                         rangelist((intrange(1,12),)))
+
+class TestExactSetOps(unittest.TestCase):
+
+    def test_drop_exact_duplicates(self):
+        R = rangelist((floatrange(1,5),floatrange(1,5,attributes={"k":1}),floatrange(1,5),
+                       floatrange(1,5,attributes={"k":1}).freeze(),floatrange(2,5)))
+        D = R.drop_exact_duplicates()
+        self.assertEqual(len(D),3)
+        self.assertEqual([r._uuid for r in D],[R[0]._uuid,R[1]._uuid,R[4]._uuid])
+
+    def test_union_intersection_difference(self):
+        A = rangelist((intrange(1,5),intrange(3,9),intrange(3,9)))
+        B = rangelist((intrange(3,9).freeze(),intrange(20,30)))
+        self.assertEqual(A.exact_union(B),rangelist((intrange(1,5),intrange(3,9),intrange(20,30))))
+        self.assertEqual(A.exact_intersection(B),rangelist((intrange(3,9),)))
+        self.assertEqual(A.exact_difference(B),rangelist((intrange(1,5),)))
+
+class TestRangeListWorkers(unittest.TestCase):
+
+    def setUp(self):
+        self.R = rangelist(floatrange(n%17,n%17+n%5+1,group=(n%7,)) for n in range(200))
+
+    def test_process_pool_matches_serial(self):
+        for name in ("unique","merge","disect","duplicates"):
+            with self.subTest(name=name):
+                serial = getattr(self.R,name)()
+                pooled = getattr(self.R,name)(workers=2)
+                self.assertEqual(pooled,serial)
+                self.assertEqual([r._uuid for r in pooled],[r._uuid for r in serial])
+
+    def test_executor(self):
+        from concurrent.futures import ThreadPoolExecutor
+        with ThreadPoolExecutor(max_workers=3) as pool:
+            self.assertEqual(self.R.unique(executor=pool),self.R.unique())
+
+    def test_windows_match_serial(self):
+        import random
+        rnd = random.Random(0)
+        R = rangelist(intrange(a,a+rnd.randint(0,9),closed=rnd.random() < 0.5,
+                               attributes={"k":rnd.randint(0,2)})
+                      for a in (rnd.randint(0,100) for _ in range(300)))
+        for name in ("unique","merge","disect"):
+            serial = getattr(R,name)()
+            for kwargs in ({"windows":7},{"window_size":2.5},{"windows":3,"workers":2}):
+                with self.subTest(name=name,**kwargs):
+                    windowed = getattr(R,name)(**kwargs)
+                    self.assertEqual([repr(r) for r in windowed],[repr(r) for r in serial])
+                    self.assertEqual([r._uuid for r in windowed],[r._uuid for r in serial])
+        with self.assertRaises(ValueError):
+            R.merge(window_size=0)
+
+class TestRangeListSetOps(unittest.TestCase):
+
+    def test_subtract_lists(self):
+        A = rangelist((floatrange(0,10),floatrange(20,30),floatrange(0,10,group=(2,))))
+        B = rangelist((floatrange(2,4),floatrange(3,5),floatrange(8,22)))
+        self.assertEqual(A - B,rangelist((floatrange(0,2),floatrange(5,8),
+                                          floatrange(22,30),
+                                          floatrange(0,10,group=(2,)))))
+
+    def test_intersect_lists(self):
+        A = rangelist((intrange(0,10),intrange(20,30,closed=False)))
+        B = rangelist((intrange(2,4),intrange(5,5),intrange(8,22)))
+        self.assertEqual(A * B,rangelist((intrange(2,5),intrange(8,10),
+                                          intrange(20,22))))
+
+    def test_join(self):
+        A = rangelist((intrange(0,9),intrange(20,30),intrange(0,9,group=(2,))))
+        B = rangelist((intrange(5,24),intrange(10,19),intrange(9,9,closed=False),
+                       intrange(8,8,group=(2,))))
+        pairs = A.join(B)
+        self.assertEqual([(a._start,b._start,o) for a,b,o in pairs],
+                         [(0,5,5),(20,5,5),(0,8,1)])
+        df = A.join(B,dataframe=True)
+        self.assertEqual(list(df["overlap"]),[5,5,1])
+        self.assertEqual(list(df["right_uuid"]),[b._uuid for a,b,o in pairs])
+        self.assertEqual(rangelist().join(B),[])
+
+class TestDataFrameConversion(unittest.TestCase):
+
+    def test_roundtrip_float(self):
+        R = rangelist((floatrange(1,10,group=("a",1),attributes={"k":1}),
+                       floatrange(3,4,group=("b",2),attributes={"k":2})))
+        df = R.to_dataframe(groupby=["name","n"])
+        self.assertEqual(list(df.columns),["start","end","uuid","name","n","k"])
+        back = rangelist.from_dataframe(df,"start","end",["name","n"],["k"],uuid="uuid")
+        self.assertEqual(back,R)
+        self.assertEqual([r._uuid for r in back],[r._uuid for r in R])
+
+    def test_roundtrip_int(self):
+        R = rangelist((intrange(1,10),intrange(3,4,closed=False,group=(2,))))
+        df = R.to_dataframe(groupby=["g"])
+        self.assertEqual(list(df["closed"]),[True,False])
+        back = rangelist.from_dataframe(df,"start","end","g",kind=intrange,closed="closed")
+        self.assertEqual(back,R)
+
+    def test_roundtrip_csv_uuids(self):
+        import io
+        import pickle
+        import pandas as pd
+        R = rangelist((intrange(1,10,attributes={"k":1}),intrange(3,4,group=(2,))))
+        buffer = io.StringIO()
+        R.to_dataframe(groupby=["g"]).to_csv(buffer,index=False)
+        buffer.seek(0)
+        df = pd.read_csv(buffer)
+        back = rangelist.from_dataframe(df,"start","end","g",["k"],kind=intrange,uuid="uuid")
+        self.assertEqual([r._uuid for r in back],[r._uuid for r in R])
+        self.assertTrue(all(isinstance(r._uuid,rangers.UUID) for r in back))
+        self.assertEqual([r._uuid for r in pickle.loads(pickle.dumps(back))],[r._uuid for r in R])
+        df.loc[1,"uuid"] = None
+        self.assertIsInstance(rangelist.from_dataframe(df,"start","end","g",uuid="uuid")[1]._uuid,
+                              rangers.UUID)
+        df.loc[1,"uuid"] = "not a uuid"
+        with self.assertRaises(ValueError):
+            rangelist.from_dataframe(df,"start","end","g",uuid="uuid")
+
+class TestIntervalConversion(unittest.TestCase):
+
+    def test_int_sides(self):
+        import pandas as pd
+        R = rangelist((intrange(1,5),intrange(3,9,closed=False,group=(2,))))
+        self.assertEqual(R.to_intervals().closed,"left")
+        self.assertEqual(list(rangelist((intrange(1,5),)).to_intervals()),[pd.Interval(1,5,closed="both")])
+        for side in ("left","right","both","neither"):
+            with self.subTest(side=side):
+                I = R.to_intervals(side)
+                back = rangelist.from_intervals(I,groups=[(1,),(2,)],kind=intrange)
+                self.assertEqual([r.__bounds__() for r in back],[r.__bounds__() for r in R])
+                self.assertEqual([r._group for r in back],[(1,),(2,)])
+        I = pd.IntervalIndex.from_tuples([(1,5)],closed="right")
+        self.assertEqual(rangelist.from_intervals(I,kind=intrange),rangelist((intrange(2,5),)))
+
+    def test_empty_open_int(self):
+        R = rangelist((intrange(1,5),intrange(3,3,closed=False)))
+        with self.assertRaisesRegex(ValueError,"closed='left'"):
+            R.to_intervals("both")
+        for side in ("left","right","neither"):
+            with self.subTest(side=side):
+                back = rangelist.from_intervals(R.to_intervals(side),kind=intrange)
+                self.assertEqual([r.__bounds__() for r in back],[r.__bounds__() for r in R])
+
+    def test_float_with_attributes(self):
+        import pandas as pd
+        I = pd.IntervalIndex.from_breaks([0,1.5,3.0])
+        with self.assertRaises(ValueError):
+            rangelist((floatrange(0,1),)).to_intervals("both")
+        R = rangelist.from_intervals(I.set_closed("left"),attributes={"v":[1,2]},step_size=0.5)
+        self.assertEqual(R,rangelist((floatrange(0,1.5,attributes={"v":1}),
+                                      floatrange(1.5,3,attributes={"v":2}))))
+        self.assertEqual(R[0].step_size,0.5)
+        with self.assertRaises(TypeError):
+            rangelist((intrange(1,2),floatrange(1,2))).to_intervals()
+
+    def test_dataframe_interval_column(self):
+        R = rangelist((intrange(1,10,group=("a",),attributes={"k":1}),
+                       intrange(3,4,group=("b",),attributes={"k":2})))
+        df = R.to_dataframe(groupby=["name"],interval="span")
+        self.assertEqual(list(df.columns),["span","uuid","name","k"])
+        back = rangelist.from_dataframe(df,"span",None,["name"],["k"],kind=intrange,uuid="uuid")
+        self.assertEqual(back,R)
+        self.assertEqual([r._uuid for r in back],[r._uuid for r in R])
+
 class TestRangeAdditions(unittest.TestCase):
 
     def test_addition(self):
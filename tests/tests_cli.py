@@ -0,0 +1,82 @@
+import io
+import os
+import tempfile
+import unittest
+import pandas as pd
+from context import rangers
+from range_ops.cli import main
+intrange   = rangers.intrange
+rangelist  = rangers.rangelist
+
+## tests:
+
+def table():
+    rows = [("A",0,10,1),("A",5,15,2),("A",20,25,1),("B",3,8,1),("A",14,30,0),
+            ("B",1,4,2),("B",8,12,1),("A",40,41,3)]
+    return pd.DataFrame(rows,columns=["chrom","lo","hi","score"])
+
+def expected(df,op,against=None):
+    R = rangelist.from_dataframe(df,"lo","hi",["chrom"],["score"],kind=intrange)
+    if op == "subtract":
+        R = R - rangelist.from_dataframe(against,"lo","hi",["chrom"],["score"],kind=intrange)
+    else:
+        R = getattr(R,op)()
+    out = R.to_dataframe(groupby=["chrom"]).drop(columns="uuid")
+    return out.rename(columns={"start":"lo","end":"hi"})
+
+class TestCommandLine(unittest.TestCase):
+
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.dir.cleanup)
+
+    def path(self,name):
+        return os.path.join(self.dir.name,name)
+
+    def run_cli(self,*argv):
+        stderr = io.StringIO()
+        main(["--start","lo","--end","hi","--group","chrom","--attributes","score",
+              "--kind","int","--chunksize","3",*argv],stderr=stderr)
+        return stderr.getvalue()
+
+    def test_operations_match_rangelist(self):
+        df = table()
+        df.to_csv(self.path("in.csv"),index=False)
+        for op in ("merge","unique","duplicates","disect"):
+            with self.subTest(op=op):
+                self.run_cli(op,self.path("in.csv"),"-o",self.path("out.csv"))
+                out = pd.read_csv(self.path("out.csv"))
+                want = expected(df,op)
+                self.assertEqual(out[["lo","hi","chrom"]].values.tolist(),
+                                 want[["lo","hi","chrom"]].values.tolist())
+
+    def test_sorted_input_in_batches(self):
+        df = table().sort_values(["chrom","lo"])
+        df.to_csv(self.path("in.csv"),index=False)
+        for op in ("merge","unique","duplicates","disect"):
+            with self.subTest(op=op):
+                self.run_cli(op,self.path("in.csv"),"-o",self.path("whole.csv"))
+                self.run_cli(op,self.path("in.csv"),"-o",self.path("batched.csv"),"--sorted")
+                self.assertTrue(pd.read_csv(self.path("whole.csv")).equals(
+                    pd.read_csv(self.path("batched.csv"))))
+        table().to_csv(self.path("unsorted.csv"),index=False)
+        with self.assertRaises(SystemExit):
+            self.run_cli("merge",self.path("unsorted.csv"),"-o",self.path("x.csv"),"--sorted")
+
+    def test_subtract_and_progress(self):
+        df,against = table(),table().iloc[[1,5]]
+        df.to_csv(self.path("in.csv"),index=False)
+        against.to_csv(self.path("b.csv"),index=False)
+        log = self.run_cli("subtract",self.path("in.csv"),"--against",self.path("b.csv"),
+                           "-o",self.path("out.csv"))
+        out = pd.read_csv(self.path("out.csv"))
+        want = expected(df,"subtract",against)
+        self.assertEqual(out[["lo","hi","chrom"]].values.tolist(),
+                         want[["lo","hi","chrom"]].values.tolist())
+        lines = log.splitlines()
+        # one line per chunk of 3 rows, then the summary with timings
+        self.assertEqual(len(lines),4)
+        self.assertIn("8 rows in",lines[-1])
+        self.assertIn("subtract",lines[-1])
+        with self.assertRaises(SystemExit):
+            self.run_cli("subtract",self.path("in.csv"))
@@ -0,0 +1,83 @@
+import unittest
+from context import rangers
+from range_ops.plan import rangeplan
+intrange   = rangers.intrange
+floatrange = rangers.floatrange
+rangelist  = rangers.rangelist
+
+## tests:
+
+def same(A,B):
+    return [(repr(a),a._uuid) for a in A] == [(repr(b),b._uuid) for b in B]
+
+def sample():
+    A = rangelist([intrange(5,15,group=(1,)),intrange(0,10),intrange(8,20),
+                   intrange(12,30,group=(1,)),floatrange(0,8,group=(2,)),
+                   floatrange(3,6,group=(2,),attributes={"k":1})])
+    B = rangelist([intrange(2,4),intrange(14,16,group=(1,)),floatrange(5,5.5,group=(2,))])
+    C = rangelist([intrange(0,12),intrange(0,25,group=(1,)),floatrange(1,7,group=(2,))])
+    return A,B,C
+
+class TestRangePlan(unittest.TestCase):
+
+    def test_matches_eager(self):
+        A,B,C = sample()
+        cases = [
+            (lambda X:X - B,lambda P:P - B),
+            (lambda X:(X - B) * C,lambda P:(P - B) * C),
+            (lambda X:((X * C) - B).merge().unique(),lambda P:((P * C) - B).merge().unique()),
+            (lambda X:X.unique().disect().disect() - B,lambda P:(P.unique().disect().disect() - B)),
+            (lambda X:(X - B).duplicates(),lambda P:(P - B).duplicates()),
+        ]
+        for n,(eager,lazy) in enumerate(cases):
+            with self.subTest(case=n):
+                P = lazy(A.lazy())
+                self.assertIsInstance(P,rangeplan)
+                self.assertTrue(same(eager(A),P.collect()))
+
+    def test_matches_eager_with_sort_key(self):
+        A,B,C = sample()
+        A.__sort_key__ = lambda r:-r._end
+        for steps in (("unique","unique"),("merge","unique"),("disect","disect"),("unique","merge")):
+            with self.subTest(steps=steps):
+                E,P = A,A.lazy()
+                for step in steps:
+                    E,P = getattr(E,step)(),getattr(P,step)()
+                self.assertTrue(same(E,P.collect()))
+        self.assertNotIn("unique after unique",A.lazy().unique().unique().explain())
+
+    def test_plan_operands(self):
+        A,B,C = sample()
+        P = A.lazy() - (C.lazy() - B)
+        self.assertTrue(same(A - (C - B),P.collect()))
+        self.assertTrue(same(A * list(C),(A.lazy() * list(C)).collect()))
+        with self.assertRaises(TypeError):
+            A.lazy() - 3
+
+    def test_select_pushdown(self):
+        A,B,C = sample()
+        P = (A.lazy() - B).unique().select([(1,),(2,)]).select([(1,)])
+        expected = rangelist([r for r in (A - B).unique() if r._group == (1,)])
+        self.assertTrue(same(expected,P.collect()))
+        self.assertEqual(set(r._group for r in P),{(1,)})
+
+    def test_lazy_until_collected(self):
+        A,B,C = sample()
+        P = (A.lazy() - B).merge()
+        Q = P.unique()
+        self.assertIsNone(P._result)
+        self.assertEqual(len(A.lazy()._ops),0)
+        self.assertEqual(len(Q),len((A - B).merge()))
+        self.assertIsNone(P._result)
+        self.assertIs(Q.collect(),Q.collect())
+
+    def test_explain_and_report(self):
+        A,B,C = sample()
+        P = ((A.lazy() - B) * C).merge().unique()
+        text = P.explain()
+        self.assertIn("sweeps fused into one mask",text)
+        self.assertIn("unique after merge dropped",text)
+        report = P.report()
+        self.assertIn("1 mask",report)
+        self.assertIn("2 merge",report)
+        self.assertTrue(report.splitlines()[-1].startswith("total"))
@@ -0,0 +1,61 @@
+import unittest
+from context import rangers
+from range_ops.profiling import instrument
+intrange   = rangers.intrange
+floatrange = rangers.floatrange
+rangelist  = rangers.rangelist
+
+## tests:
+
+def sample():
+    return rangelist([intrange(1,10),intrange(5,15),floatrange(0,4,group=(2,)),
+                      floatrange(2,6,group=(2,))])
+
+class TestInstrument(unittest.TestCase):
+
+    def test_counts_and_allocations(self):
+        R = sample()
+        with instrument() as probe:
+            U = R.unique()
+            R.merge()
+        stats = probe.snapshot()
+        self.assertEqual(stats["rangelist.unique"]["calls"],1)
+        self.assertEqual(stats["rangelist.merge"]["calls"],1)
+        self.assertGreaterEqual(stats["rangelist.groupdict"]["calls"],2)
+        # unique clips the second range of each group
+        self.assertGreaterEqual(stats["rangelist.unique"]["allocations"],2)
+        self.assertEqual(probe.allocations,sum(s["allocations"] for name,s in stats.items()
+                                               if name in ("rangelist.unique","rangelist.merge")))
+        unique = stats["rangelist.unique"]
+        self.assertLessEqual(unique["self_seconds"],unique["seconds"])
+        self.assertEqual([str(r) for r in U],[str(r) for r in sample().unique()])
+
+    def test_disable_restores_methods(self):
+        originals = (rangelist.unique,intrange.__sub__,intrange.__init__,rangelist.__covered__)
+        probe = instrument().enable()
+        self.assertTrue(probe.enabled)
+        self.assertIsNot(rangelist.unique,originals[0])
+        with self.assertRaises(RuntimeError):
+            instrument().enable()
+        probe.disable()
+        self.assertFalse(probe.enabled)
+        self.assertEqual((rangelist.unique,intrange.__sub__,intrange.__init__,rangelist.__covered__),
+                         originals)
+        R = sample()
+        R.unique()
+        self.assertNotIn("rangelist.unique",probe.snapshot())
+
+    def test_callbacks_see_outermost_calls(self):
+        seen = []
+        with instrument(callbacks=[lambda *record:seen.append(record)]) as probe:
+            sample().unique()
+            intrange(1,10) - intrange(3,4)
+        self.assertEqual([name for name,seconds,allocs in seen],
+                         ["rangelist.unique","intrange.__sub__"])
+        self.assertEqual(seen[-1][2],2)
+        self.assertIn("rangelist.unique",probe.report())
+        probe.reset()
+        self.assertEqual(probe.snapshot(),{})
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,69 @@
+import random
+import numpy as np
+import unittest
+from context import rangers
+from range_ops.rangearray import rangearray
+intrange   = rangers.intrange
+floatrange = rangers.floatrange
+rangelist  = rangers.rangelist
+
+## tests:
+
+def sample(kind,n,seed):
+    rnd = random.Random(seed)
+    R = rangelist()
+    for _ in range(n):
+        a = rnd.randint(0,60)
+        b = a + rnd.randint(1,15)
+        grp = (rnd.randint(1,3),)
+        if kind is intrange:
+            R.append(intrange(a,b,closed=rnd.random()<0.6,group=grp))
+        else:
+            R.append(floatrange(a,b,group=grp,attributes={"n":rnd.randint(0,9)}))
+    return R
+
+class TestRangeArray(unittest.TestCase):
+
+    def assertSameRanges(self,first,second):
+        self.assertEqual(first,second)
+        self.assertEqual([r._uuid for r in first],[r._uuid for r in second])
+
+    def test_roundtrip(self):
+        for kind in (intrange,floatrange):
+            R = sample(kind,50,1)
+            A = rangearray.from_rangelist(R)
+            self.assertEqual(len(A),50)
+            self.assertIs(A.kind,kind)
+            self.assertSameRanges(A.to_rangelist(),R)
+
+    def test_intervals(self):
+        import pandas as pd
+        I = pd.arrays.IntervalArray.from_tuples([(1,5),(7,9),(4,6)],closed="right")
+        A = rangearray.from_intervals(I,groups=["x","y","x"],kind=intrange)
+        self.assertEqual((A.groups,A.codes.tolist()),(["x","y"],[0,1,0]))
+        self.assertEqual([r.__bounds__() for r in A.to_rangelist()],[(2,6),(8,10),(5,7)])
+        self.assertTrue(all(r._uuid.version == 4 for r in A.to_rangelist()))
+        self.assertEqual(list(A.to_intervals("right")),list(I))
+        F = rangearray.from_rangelist(sample(floatrange,30,1))
+        self.assertTrue(np.shares_memory(F.to_intervals().left.to_numpy(),F.starts))
+
+    def test_mixed_kinds(self):
+        with self.assertRaises(TypeError):
+            rangearray.from_rangelist((intrange(1,2),floatrange(1,2)))
+
+    def test_kernels_match_rangelist(self):
+        for kind in (intrange,floatrange):
+            for seed in range(20):
+                R,S = sample(kind,40,seed),sample(kind,20,seed+100)
+                A,B = rangearray.from_rangelist(R),rangearray.from_rangelist(S)
+                with self.subTest(kind=kind,seed=seed):
+                    self.assertSameRanges(A.merge().to_rangelist(),R.merge())
+                    self.assertSameRanges(A.disect().to_rangelist(),R.disect())
+                    self.assertSameRanges(A.subtract(B).to_rangelist(),R - S)
+                    self.assertSameRanges(A.intersect(B).to_rangelist(),R * S)
+                    if kind is intrange:
+                        # float samples carry attributes, which break rank ties
+                        self.assertSameRanges(A.unique().to_rangelist(),R.unique())
+
+if __name__ == "__main__":
+    unittest.main(exit=False)
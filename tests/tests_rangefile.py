@@ -0,0 +1,77 @@
+import os
+import tempfile
+import unittest
+from context import rangers
+from range_ops.rangearray import rangearray
+from range_ops.rangefile import write_rangefile, rangefile
+intrange   = rangers.intrange
+floatrange = rangers.floatrange
+rangelist  = rangers.rangelist
+
+## tests:
+
+class TestRangeFile(unittest.TestCase):
+
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.dir.name,"ranges.bin")
+
+    def tearDown(self):
+        self.dir.cleanup()
+
+    def assertSameRanges(self,A,B):
+        self.assertEqual([repr(r) for r in A],[repr(r) for r in B])
+        self.assertEqual([r._uuid for r in A],[r._uuid for r in B])
+
+    def test_roundtrip_int(self):
+        R = rangelist((intrange(1,5,attributes={"tags":["a"]}),
+                       intrange(3,9,closed=False,group=("x",2),attributes={"k":2}),
+                       intrange(7,7,attributes={"k":2})))
+        write_rangefile(R,self.path)
+        with rangefile(self.path) as F:
+            self.assertEqual((len(F),F.kind),(3,intrange))
+            L = F.to_rangelist()
+            self.assertSameRanges(L,R)
+            # equal attribute dicts are stored once but loaded as copies
+            self.assertIsNot(L[1]._attributes,L[2]._attributes)
+
+    def test_roundtrip_equal_values_of_other_types(self):
+        values = [True,1,1.0,(1,),(True,),False,0]
+        R = rangelist(intrange(n,n+1,attributes={"flag":v}) for n,v in enumerate(values))
+        write_rangefile(R,self.path)
+        L = rangefile(self.path).to_rangelist()
+        self.assertSameRanges(L,R)
+        self.assertEqual([type(r._attributes["flag"]) for r in L],list(map(type,values)))
+        self.assertEqual([r._attributes["flag"] for r in L[3:5]],[(1,),(True,)])
+        self.assertIs(L[4]._attributes["flag"][0],True)
+
+    def test_roundtrip_float_and_empty(self):
+        R = rangelist((floatrange(1,5,step_size=0.5),floatrange(2,3,group=(2,))))
+        write_rangefile(rangearray.from_rangelist(R),self.path)
+        self.assertSameRanges(rangefile(self.path).to_rangelist(),R)
+        write_rangefile(rangelist(),self.path)
+        self.assertEqual(len(rangefile(self.path).to_rangelist()),0)
+
+    def test_windows_are_views(self):
+        R = rangelist(floatrange(n,n+2,group=(n%3,)) for n in range(100))
+        write_rangefile(R,self.path)
+        F = rangefile(self.path)
+        W = F[10:20]
+        self.assertIsInstance(W,rangearray)
+        self.assertFalse(W.starts.flags.writeable)
+        self.assertIsNotNone(W.starts.base)
+        self.assertSameRanges(W.to_rangelist(),R[10:20])
+        self.assertSameRanges(F.to_rangelist(95,200),R[95:])
+        self.assertEqual([len(c) for c in F.chunks(40)],[40,40,20])
+        self.assertEqual(F.column("codes").tolist(),[n%3 for n in range(100)])
+        with self.assertRaises(TypeError):
+            F[::2]
+
+    def test_not_a_rangefile(self):
+        with open(self.path,"wb") as f:
+            f.write(b"start,end\n" + b"0"*64)
+        with self.assertRaises(ValueError):
+            rangefile(self.path)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,48 @@
+import random
+import unittest
+from context import rangers
+from range_ops.rangeindex import rangeindex
+intrange   = rangers.intrange
+floatrange = rangers.floatrange
+rangelist  = rangers.rangelist
+
+## tests:
+
+class TestRangeIndex(unittest.TestCase):
+
+    def setUp(self):
+        rnd = random.Random(7)
+        self.R = rangelist()
+        for _ in range(300):
+            a = rnd.randint(0,500)
+            self.R.append(intrange(a,a+rnd.randint(0,30),
+                                   closed=rnd.random()<0.5,
+                                   group=(rnd.randint(1,3),)))
+        self.I = rangeindex(self.R)
+
+    def test_stab(self):
+        for x in range(-5,540,7):
+            for grp in ((1,),(2,),None):
+                expected = [r for r in self.R if x in r and grp in (None,r._group)]
+                found = self.I.stab(x,group=grp)
+                self.assertEqual(sorted(map(id,found)),sorted(map(id,expected)))
+
+    def test_overlap(self):
+        for a in range(0,540,11):
+            b = a + 9
+            expected = [r for r in self.R if r._group == (2,) and r.extent()
+                        and r.__bounds__()[0] < b and r.__bounds__()[1] > a]
+            found = self.I.overlap(a,b,group=(2,))
+            self.assertEqual(sorted(map(id,found)),sorted(map(id,expected)))
+
+    def test_overlap_with_range(self):
+        I = rangeindex(rangelist((floatrange(0,10),floatrange(10,20),
+                                  floatrange(5,8,group=(2,)))))
+        self.assertEqual(I.overlap(floatrange(9,12)),
+                         rangelist((floatrange(0,10),floatrange(10,20))))
+        self.assertEqual(I.stab(10),rangelist((floatrange(10,20),)))
+        self.assertEqual(len(I),3)
+        self.assertGreater(I.nbytes(),0)
+
+if __name__ == "__main__":
+    unittest.main(exit=False)
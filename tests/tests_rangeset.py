@@ -0,0 +1,77 @@
+import random
+import unittest
+from context import rangers
+from range_ops import rangeset as rangeset_module
+from range_ops.rangeset import rangeset
+intrange   = rangers.intrange
+floatrange = rangers.floatrange
+rangelist  = rangers.rangelist
+
+## tests:
+
+class TestRangeSet(unittest.TestCase):
+
+    def test_add_merges_adjoining(self):
+        S = rangeset((intrange(1,5),intrange(8,10),floatrange(0,1,group=(2,))))
+        S.add(intrange(6,7))
+        self.assertEqual(list(S),[intrange(1,10),floatrange(0,1,group=(2,))])
+        S.add(intrange(12,14,closed=False))
+        self.assertEqual(len(S),3)
+        self.assertEqual(S.to_rangelist(),rangelist((intrange(1,10),intrange(12,13),
+                                                     floatrange(0,1,group=(2,)))))
+
+    def test_discard_and_contains(self):
+        S = rangeset((floatrange(0,10),))
+        S.discard(floatrange(3,4))
+        self.assertEqual(list(S),[floatrange(0,3),floatrange(4,10)])
+        self.assertIn(floatrange(5,10),S)
+        self.assertNotIn(floatrange(2,5),S)
+        self.assertIn(2.5,S)
+        self.assertNotIn(3.5,S)
+        self.assertFalse(S.contains(1,group=(2,)))
+        with self.assertRaises(KeyError):
+            S.remove(floatrange(2,5))
+        S.remove(floatrange(0,3))
+        S.remove(floatrange(4,10))
+        self.assertEqual((len(S),S.groups()),(0,[]))
+
+    def test_first_gap(self):
+        S = rangeset((intrange(1,5),intrange(8,10),intrange(13,20)))
+        self.assertEqual(S.first_gap(2,start=0),6)
+        self.assertEqual(S.first_gap(2,start=7),11)
+        self.assertEqual(S.first_gap(3,start=0),21)
+        self.assertEqual(S.first_gap(3,start=12),21)
+        self.assertEqual(S.first_gap(3,start=30),30)
+        self.assertEqual(S.first_gap(3,start=0,group=(2,)),0)
+
+    def test_random_edits_match_points(self):
+        # small blocks so edits cross block boundaries
+        load = rangeset_module.LOAD
+        rangeset_module.LOAD = 3
+        try:
+            rnd = random.Random(0)
+            S,cover = rangeset(),set()
+            for _ in range(500):
+                a = rnd.randint(0,100)
+                r = intrange(a,a+rnd.randint(0,10),closed=rnd.random()<0.5)
+                points = set(range(*r.__bounds__()))
+                if rnd.random() < 0.65:
+                    S.add(r)
+                    cover |= points
+                else:
+                    S.discard(r)
+                    cover -= points
+                got = set()
+                for m in S:
+                    got |= set(range(*m.__bounds__()))
+                self.assertEqual(got,cover)
+                x,length = rnd.randint(0,120),rnd.randint(1,6)
+                expected = x
+                while cover & set(range(expected,expected+length)):
+                    expected += 1
+                self.assertEqual(S.first_gap(length,x),expected)
+        finally:
+            rangeset_module.LOAD = load
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,61 @@
+import random
+import unittest
+from context import rangers
+from range_ops.streaming import merge_stream, unique_stream, merge_sources
+intrange   = rangers.intrange
+floatrange = rangers.floatrange
+rangelist  = rangers.rangelist
+
+## tests:
+
+def sample(seed,n=60):
+    rnd = random.Random(seed)
+    R = rangelist()
+    for _ in range(n):
+        a = rnd.randint(0,80)
+        R.append(intrange(a,a+rnd.randint(0,12),closed=rnd.random()<0.6,
+                          group=(rnd.randint(1,3),)))
+    return rangelist(sorted(R,key=lambda r:(r._group,r._start,r._end)))
+
+class TestStreaming(unittest.TestCase):
+
+    def assertSameRanges(self,first,second):
+        self.assertEqual(first,second)
+        self.assertEqual([r._uuid for r in first],[r._uuid for r in second])
+
+    def test_merge_stream(self):
+        for seed in range(20):
+            R = sample(seed)
+            self.assertSameRanges(rangelist(merge_stream(iter(R))),R.merge())
+
+    def test_empty_range_opens_group(self):
+        R = rangelist([floatrange(0,10,group=("a",)),floatrange(3,3,group=("b",)),
+                       floatrange(5,8,group=("b",))])
+        self.assertSameRanges(rangelist(merge_stream(iter(R))),R.merge())
+        self.assertSameRanges(rangelist(unique_stream(iter(R))),R.unique())
+
+    def test_unique_stream(self):
+        for seed in range(20):
+            R = sample(seed)
+            self.assertSameRanges(rangelist(unique_stream(iter(R))),R.unique())
+
+    def test_unique_stream_ties(self):
+        R = rangelist([intrange(28,31,attributes={"k":1}),
+                       intrange(28,31,closed=False,attributes={"k":0})])
+        S = rangelist(sorted(R))
+        self.assertSameRanges(rangelist(unique_stream(iter(S))),R.unique())
+
+    def test_merge_sources(self):
+        days = [sample(seed,20) for seed in range(4)]
+        combined = rangelist(r for day in days for r in day)
+        streamed = rangelist(merge_stream(merge_sources(*map(iter,days))))
+        self.assertEqual(streamed,combined.merge())
+
+    def test_unsorted_input(self):
+        with self.assertRaises(ValueError):
+            list(merge_stream([floatrange(5,6),floatrange(1,2)]))
+        with self.assertRaises(ValueError):
+            list(unique_stream([floatrange(1,2),floatrange(1,2,group=(2,)),floatrange(3,4)]))
+
+if __name__ == "__main__":
+    unittest.main(exit=False)